@@ -0,0 +1,83 @@
+"""
+Background images, decoded on demand and kept in a small LRU cache.
+
+Only screen-sized, display-converted copies are kept, never the full
+resolution originals. prefetch() decodes and scales on a worker thread, so
+the image for the next arc is usually ready before it is needed; get()
+decodes on the spot only if it isn't.
+"""
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+
+def find_image(filename, prefer_jpg=False):
+    """`filename`, or its .jpg/.jpeg sibling when preferred and present."""
+    if prefer_jpg:
+        stem = os.path.splitext(filename)[0]
+        for extension in (".jpg", ".jpeg"):
+            if os.path.exists(stem + extension):
+                return stem + extension
+    return filename
+
+
+class AssetManager:
+    """
+    Screen-sized backgrounds by name.
+
+    `files` maps each name to an image file, or to None for a plain black
+    surface. At most `capacity` scaled surfaces are kept; the least recently
+    used one is dropped first.
+    """
+
+    def __init__(self, files, size, capacity=3, prefer_jpg=False):
+        self.files = files
+        self.size = size
+        self.capacity = capacity
+        self.prefer_jpg = prefer_jpg
+        self.surfaces = OrderedDict()
+        self.pending = {}
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+
+    def _decode(self, name, size):
+        # Runs on the worker thread: file read, decode and scale, no display access
+        filename = self.files[name]
+        if filename is None:
+            surface = pygame.Surface(size)
+            surface.fill((0, 0, 0))
+            return surface
+        image = pygame.image.load(find_image(filename, self.prefer_jpg))
+        return pygame.transform.scale(image, size)
+
+    def prefetch(self, name):
+        """Start decoding `name` in the background unless it is cached or on its way."""
+        if name in self.surfaces:
+            self.surfaces.move_to_end(name)
+        elif name not in self.pending:
+            self.pending[name] = self.executor.submit(self._decode, name, self.size)
+
+    def get(self, name):
+        surface = self.surfaces.get(name)
+        if surface is not None:
+            self.surfaces.move_to_end(name)
+            return surface
+        future = self.pending.pop(name, None)
+        scaled = future.result() if future is not None else self._decode(name, self.size)
+        surface = scaled.convert()
+        self.surfaces[name] = surface
+        while len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def resize(self, size):
+        """Drop everything scaled for the old size."""
+        if size != self.size:
+            self.size = size
+            self.surfaces.clear()
+            # Decodes already queued are for the old size; let them finish unused
+            self.pending.clear()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
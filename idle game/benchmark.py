@@ -0,0 +1,222 @@
+"""
+Benchmarks for the economy and the frame loop.
+
+Runs headless under SDL's dummy video driver, so it works over SSH and in CI:
+
+    python benchmark.py                          # print timings
+    python benchmark.py --json results.json      # also save them
+    python benchmark.py --baseline results.json  # compare, exit 1 on regressions
+
+Every number is the best of several repeats, in microseconds per call.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from bignum import BigNum
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LEVELS = [0, 1, 199, 200, 1000, 4000, 8000]
+MAGNITUDES = [0, 3, 6, 12, 24, 36, 48, 60, 66, 150, 299, 1000]
+
+
+def load_game_module():
+    # idle-game.py has a hyphen in its name, so it cannot be imported normally
+    spec = importlib.util.spec_from_file_location("idle_game", os.path.join(HERE, "idle-game.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(func, number, repeat=5):
+    """Best time per call of func(), in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def bench_format_number(game_module, results, scale):
+    for exponent in MAGNITUDES:
+        value = BigNum(f"1.2345e{exponent}")
+        if exponent < 300:
+            value = float(value)
+        results[f"format_number/1e{exponent}"] = measure(lambda: game_module.format_number(value), 20000 // scale)
+
+
+def bench_tier_math(game, results, scale):
+    button = game.all_buttons[0]
+    tier = button.tier
+    for level in LEVELS:
+        tier.level = level
+        results[f"get_rps/level_{level}"] = measure(button.get_rps, 20000 // scale)
+        results[f"get_cost/level_{level}"] = measure(button.get_cost, 20000 // scale)
+
+        def get_cost_uncached():
+            tier._cost_level = None
+            return button.get_cost()
+        results[f"get_cost_uncached/level_{level}"] = measure(get_cost_uncached, 20000 // scale)
+    tier.level = 0
+    game.state.recompute_total_rps()
+    game.state.recompute_aggregates()
+
+
+def bench_bulk_buy(game, results, scale):
+    """One click on a button at each purchase multiplier, always from the same level."""
+    button = game.all_buttons[0]
+    tier = button.tier
+    event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=button.rect.center, button=1)
+    rich = BigNum("1e300")
+
+    for index, multiplier in enumerate(game.purchase_multipliers):
+        game.current_multiplier_index = index
+
+        def click():
+            tier.level = 500
+            game.state.resource = rich
+            button.handle_event(event, game, game)
+            game.simulation.flush()   # clicks are queued until the next economy step
+        results[f"handle_event/buy_{multiplier}"] = measure(click, 2000 // scale)
+
+    game.current_multiplier_index = 0
+    tier.level = 0
+    game.state.resource = BigNum(0)
+    game.state.recompute_total_rps()
+    game.state.recompute_aggregates()
+
+
+def bench_prestige(game, results, scale):
+    for tier in game.state.tiers:
+        tier.level = 1000
+    game.state.recompute_aggregates()
+    results["calculate_prestige_gain"] = measure(game.state.calculate_prestige_gain, 100000 // scale)
+    game.state.reset_tiers()
+
+
+def bench_save_load(game, results, scale):
+    for tier in game.state.tiers:
+        tier.level = 250
+    game.state.recompute_total_rps()
+    game.state.recompute_aggregates()
+    filename = os.path.join(tempfile.mkdtemp(), "bench_save.dat")
+    try:
+        # save_game/load_game print a line per call
+        with contextlib.redirect_stdout(io.StringIO()):
+            results["save_game"] = measure(lambda: game.save_game(filename), 200 // scale)
+            results["load_game"] = measure(lambda: game.load_game(filename), 200 // scale)
+    finally:
+        os.remove(filename)
+        os.rmdir(os.path.dirname(filename))
+    game.state.reset_tiers()
+
+
+def bench_draw(game_module, game, results, scale):
+    """Full repaints and steady (nothing changed) frames on every page and arc."""
+    for arc_index in range(len(game_module.ARCS)):
+        game.state.arc_index = arc_index
+        game.update_background()
+        game.arc_flash_time = 0   # keep the arc title fade out of the numbers
+        for page in range(game.total_pages):
+            game.current_page = page
+            game.buttons = game.get_current_page_buttons()
+
+            def full_frame():
+                game.renderer.invalidate()
+                game.draw()
+            results[f"draw_full/arc_{arc_index}/page_{page}"] = measure(full_frame, 50 // scale)
+            game.draw()
+            results[f"draw_steady/arc_{arc_index}/page_{page}"] = measure(game.draw, 200 // scale)
+    game.state.recompute_aggregates()
+    game.update_background()
+
+
+def run_benchmarks(scale=1):
+    game_module = load_game_module()
+    # Keep the benchmark away from the player's real save
+    save_dir = tempfile.mkdtemp()
+    game_module.IdleGame.SAVE_FILE = os.path.join(save_dir, "save.dat")
+    game_module.IdleGame.LEGACY_SAVE_FILE = os.path.join(save_dir, "save.json")
+    game_module.IdleGame.JOURNAL_FILE = os.path.join(save_dir, "save.journal")
+
+    pygame.init()
+    game = game_module.IdleGame()
+    results = {}
+    try:
+        bench_format_number(game_module, results, scale)
+        bench_tier_math(game, results, scale)
+        bench_bulk_buy(game, results, scale)
+        bench_prestige(game, results, scale)
+        bench_save_load(game, results, scale)
+        bench_draw(game_module, game, results, scale)
+    finally:
+        game.autosaver.close()
+        game.journal.close()
+        os.remove(game_module.IdleGame.JOURNAL_FILE)
+        pygame.quit()
+        os.rmdir(save_dir)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print current vs baseline; returns the names that got slower than `threshold` times."""
+    regressions = []
+    print(f"{'benchmark':<40}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<40}{'-':>12}{current:>12.2f}{'new':>8}")
+            continue
+        ratio = current / before if before else float("inf")
+        flag = "  <-- slower" if ratio > threshold else ""
+        print(f"{name:<40}{before:>12.2f}{current:>12.2f}{ratio:>8.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--json", metavar="PATH", help="write results to this JSON file")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results saved with --json")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio that counts as a regression (default 1.25)")
+    parser.add_argument("--quick", action="store_true", help="10x fewer iterations, for a smoke run")
+    args = parser.parse_args()
+
+    # Relative asset paths (backgrounds) need the game directory
+    os.chdir(HERE)
+    results = run_benchmarks(scale=10 if args.quick else 1)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "platform": platform.platform(),
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold}x")
+            sys.exit(1)
+    else:
+        for name, micros in results.items():
+            print(f"{name:<40}{micros:>12.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+import math
+import sys
+
+# Powers of ten that fit in a float, indexed by exponent + _POW10_OFFSET
+_POW10_OFFSET = 307
+_POW10 = [10.0 ** e for e in range(-_POW10_OFFSET, 309)]
+
+# Beyond this exponent gap the smaller operand cannot change a float mantissa
+_ADD_PRECISION = 17
+
+# Ints at least this large are split digit-wise instead of through float()
+_INT_FLOAT_LIMIT = 10 ** 300
+
+LN10 = math.log(10)
+
+
+class BigNum:
+    """
+    Number stored as mantissa * 10**exponent, so it never overflows like a float.
+
+    The mantissa is a float with 1 <= |m| < 10 (or exactly 0), the exponent a
+    plain int. Values are immutable: every operation returns a new BigNum.
+    Plain ints and floats can be mixed in freely.
+    """
+
+    __slots__ = ("m", "e")
+
+    def __init__(self, value=0.0):
+        if isinstance(value, BigNum):
+            self.m = value.m
+            self.e = value.e
+        elif isinstance(value, str):
+            self.m, self.e = _parse(value)
+        elif isinstance(value, int) and not -_INT_FLOAT_LIMIT < value < _INT_FLOAT_LIMIT:
+            self.m, self.e = _split_int(value)
+        else:
+            self.m, self.e = _split_float(float(value))
+
+    @classmethod
+    def from_log10(cls, log_value, sign=1):
+        """Build sign * 10**log_value without ever leaving log space."""
+        e = math.floor(log_value)
+        return _make(sign * 10.0 ** (log_value - e), e)
+
+    # --- Conversions ---
+
+    def log10(self):
+        if self.m <= 0:
+            raise ValueError("math domain error")
+        return math.log10(self.m) + self.e
+
+    def log(self):
+        return self.log10() * LN10
+
+    def __float__(self):
+        if self.e > 308:
+            return math.copysign(math.inf, self.m)
+        if self.e < -_POW10_OFFSET:
+            if self.e < -323:
+                return 0.0
+            return self.m * _POW10[self.e + 300 + _POW10_OFFSET] * 1e-300
+        return self.m * _POW10[self.e + _POW10_OFFSET]
+
+    def __int__(self):
+        if self.e < 300:
+            return int(float(self))
+        return int(self.m * 1e15) * 10 ** (self.e - 15)
+
+    def __bool__(self):
+        return self.m != 0
+
+    def to_json(self):
+        """Plain float while it fits (keeps old saves readable), else a string."""
+        if self.e < 300:
+            return float(self)
+        return str(self)
+
+    def __str__(self):
+        return f"{self.m!r}e{self.e}"
+
+    def __repr__(self):
+        return f"BigNum('{self!s}')"
+
+    def __format__(self, spec):
+        if not spec:
+            return str(self)
+        if spec[-1] in "eE":
+            precision = int(spec[spec.index(".") + 1:-1]) if "." in spec else 6
+            m, e = self.m, self.e
+            digits = f"{m:.{precision}f}"
+            if abs(float(digits)) >= 10:
+                m, e = m / 10, e + 1
+                digits = f"{m:.{precision}f}"
+            sign = "+" if e >= 0 else "-"
+            return f"{digits}{spec[-1]}{sign}{abs(e):02d}"
+        # Other specs go through float, so past 1e308 they print inf
+        return format(float(self), spec)
+
+    # --- Arithmetic ---
+
+    def __neg__(self):
+        return _make(-self.m, self.e)
+
+    def __abs__(self):
+        return _make(abs(self.m), self.e)
+
+    def __add__(self, other):
+        if not isinstance(other, BigNum):
+            other = _coerce(other)
+        if other.m == 0:
+            return self
+        if self.m == 0:
+            return other
+        diff = self.e - other.e
+        if diff > _ADD_PRECISION:
+            return self
+        if diff < -_ADD_PRECISION:
+            return other
+        if diff >= 0:
+            m = self.m + other.m / _POW10[diff + _POW10_OFFSET]
+            e = self.e
+        else:
+            m = other.m + self.m / _POW10[_POW10_OFFSET - diff]
+            e = other.e
+        # Same-sign sums stay below 20, so this covers almost every call
+        if 1.0 <= m < 10.0:
+            return _make(m, e)
+        return _normalize(m, e)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if not isinstance(other, BigNum):
+            other = _coerce(other)
+        return self.__add__(_make(-other.m, other.e))
+
+    def __rsub__(self, other):
+        return _coerce(other).__sub__(self)
+
+    def __mul__(self, other):
+        if not isinstance(other, BigNum):
+            other = _coerce(other)
+        return _normalize(self.m * other.m, self.e + other.e)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not isinstance(other, BigNum):
+            other = _coerce(other)
+        if other.m == 0:
+            raise ZeroDivisionError("BigNum division by zero")
+        return _normalize(self.m / other.m, self.e - other.e)
+
+    def __rtruediv__(self, other):
+        return _coerce(other).__truediv__(self)
+
+    def __pow__(self, power):
+        if self.m == 0:
+            return _make(0.0, 0) if power > 0 else _make(1.0, 0)
+        sign = 1
+        if self.m < 0:
+            if power != int(power):
+                raise ValueError("negative BigNum raised to a fractional power")
+            sign = -1 if int(power) % 2 else 1
+        return BigNum.from_log10(power * (math.log10(abs(self.m)) + self.e), sign)
+
+    # --- Comparison ---
+
+    def _cmp(self, other):
+        a, b = self.m, other.m
+        if a == 0 or b == 0 or (a > 0) != (b > 0):
+            return (a > b) - (a < b)
+        if self.e != other.e:
+            result = 1 if self.e > other.e else -1
+            return result if a > 0 else -result
+        return (a > b) - (a < b)
+
+    def __eq__(self, other):
+        if not isinstance(other, BigNum):
+            if not isinstance(other, (int, float)):
+                return NotImplemented
+            if not _is_finite(other):
+                return False
+            other = _coerce(other)
+        return self.m == other.m and self.e == other.e
+
+    # Each comparison first tries the common case (both positive, different
+    # magnitudes), where the exponents alone decide
+
+    def __lt__(self, other):
+        if not isinstance(other, BigNum):
+            if not _is_finite(other):
+                return 0.0 < other
+            other = _coerce(other)
+        if self.m > 0 and other.m > 0 and self.e != other.e:
+            return self.e < other.e
+        return self._cmp(other) < 0
+
+    def __le__(self, other):
+        if not isinstance(other, BigNum):
+            if not _is_finite(other):
+                return 0.0 <= other
+            other = _coerce(other)
+        if self.m > 0 and other.m > 0 and self.e != other.e:
+            return self.e < other.e
+        return self._cmp(other) <= 0
+
+    def __gt__(self, other):
+        if not isinstance(other, BigNum):
+            if not _is_finite(other):
+                return 0.0 > other
+            other = _coerce(other)
+        if self.m > 0 and other.m > 0 and self.e != other.e:
+            return self.e > other.e
+        return self._cmp(other) > 0
+
+    def __ge__(self, other):
+        if not isinstance(other, BigNum):
+            if not _is_finite(other):
+                return 0.0 >= other
+            other = _coerce(other)
+        if self.m > 0 and other.m > 0 and self.e != other.e:
+            return self.e > other.e
+        return self._cmp(other) >= 0
+
+    def __hash__(self):
+        if self.e < 300:
+            return hash(float(self))
+        return hash((self.m, self.e))
+
+
+def _make(m, e):
+    num = object.__new__(BigNum)
+    num.m = m
+    num.e = e
+    return num
+
+
+def _normalize(m, e):
+    a = abs(m)
+    if 1.0 <= a < 10.0:
+        return _make(m, e)
+    if a == 0:
+        return _make(0.0, 0)
+    if 10.0 <= a < 100.0:
+        return _make(m / 10.0, e + 1)
+    shift_m, shift_e = _split_float(m)
+    return _make(shift_m, e + shift_e)
+
+
+def _split_float(x):
+    if x == 0:
+        return 0.0, 0
+    if math.isinf(x) or math.isnan(x):
+        raise OverflowError(f"cannot convert {x} to BigNum")
+    a = abs(x)
+    offset = 0
+    if a < 1e-300:
+        x *= 1e300
+        a *= 1e300
+        offset = -300
+    e = math.floor(math.log10(a))
+    m = x / _POW10[e + _POW10_OFFSET]
+    # log10 can land one off right at a power of ten
+    if abs(m) >= 10.0:
+        m /= 10.0
+        e += 1
+    elif abs(m) < 1.0:
+        m *= 10.0
+        e -= 1
+    return m, e + offset
+
+
+def _split_int(n):
+    e = int(math.log10(abs(n)))
+    m = (n // 10 ** (e - 17)) / 1e17 if n > 0 else -((-n) // 10 ** (e - 17)) / 1e17
+    m, shift = _split_float(m)
+    return m, e + shift
+
+
+def _parse(text):
+    text = text.strip().lower()
+    if "e" in text:
+        mantissa, exponent = text.split("e")
+        m, e = _split_float(float(mantissa))
+        return m, e + int(exponent)
+    return _split_float(float(text))
+
+
+def _is_finite(value):
+    # Every BigNum is finite, so against inf or nan it compares the way 0.0 would
+    return not isinstance(value, float) or math.isfinite(value)
+
+
+def _coerce(value):
+    if isinstance(value, BigNum):
+        return value
+    if isinstance(value, (int, float)):
+        return BigNum(value)
+    raise TypeError(f"unsupported operand type for BigNum: {type(value).__name__}")
+
+
+# --- Microbenchmark: python bignum.py ---
+
+def _benchmark(number=200000):
+    import timeit
+
+    level = 1500
+    cases = {
+        "float": {
+            "setup": "a = 1.23e150; b = 4.56e149; g = 1.15",
+            "add": "a + b",
+            "mul": "a * b",
+            "pow": "g ** 1500",
+            "compare": "a >= b",
+            "log": "math.log10(a)",
+        },
+        "int": {
+            "setup": f"a = 123 * 10 ** {level}; b = 456 * 10 ** {level - 1}; g = 115",
+            "add": "a + b",
+            "mul": "a * b",
+            "pow": f"g ** {level} // 100 ** {level}",
+            "compare": "a >= b",
+            "log": "math.log10(a)",
+        },
+        "BigNum": {
+            "setup": f"a = BigNum('1.23e{level}'); b = BigNum('4.56e{level - 1}'); g = BigNum(1.15)",
+            "add": "a + b",
+            "mul": "a * b",
+            "pow": f"g ** {level}",
+            "compare": "a >= b",
+            "log": "a.log10()",
+        },
+    }
+    ops = ["add", "mul", "pow", "compare", "log"]
+    namespace = {"BigNum": BigNum, "math": math}
+    print(f"{'type':<8}" + "".join(f"{op:>12}" for op in ops) + "   (ns per op)")
+    for kind, case in cases.items():
+        row = f"{kind:<8}"
+        for op in ops:
+            runs = number if kind != "int" or op != "pow" else number // 100
+            seconds = min(timeit.repeat(case[op], case["setup"], globals=namespace, number=runs, repeat=3))
+            row += f"{seconds / runs * 1e9:>12.0f}"
+        print(row)
+    print(f"float ops run near 1e150 (the float limit), int and BigNum ops near 1e{level}.")
+
+
+if __name__ == "__main__":
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,600 @@
+"""
+Headless game economy: tier data, purchases, prestige and save state.
+
+Nothing in here imports pygame or touches assets, so a GameState can be
+created and ticked on a machine with no display. IdleGame renders on top of it.
+"""
+import math
+import sys
+from array import array
+from bisect import bisect_right
+
+from bignum import BigNum
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: without NumPy the catalog columns are plain arrays and loop in Python
+    np = None
+
+# Cost of every tier grows by this factor per level bought
+COST_GROWTH = 1.15
+BIG_COST_GROWTH = BigNum(COST_GROWTH)
+LOG10_COST_GROWTH = math.log10(COST_GROWTH)
+TIERS_PER_PAGE = 24
+
+# Tier base RPS and base cost
+TIER_RPS_FLAT = [
+    0.01, 0.08, 0.6,
+    4, 33, 150,
+    940, 8700, 64000,
+    510000, 44*(10**5), 32*(10**6),
+    24*(10**7), 11*(10**8), 90*(10**8),
+    62*(10**9), 32*(10**10), 13*(10**11),
+    84*(10**11), 63*(10**12), 34*(10**13),
+    21*(10**14), 19*(10**15), 93*(10**15),
+
+    #NEXT PAGE
+    63*(10**16), 42*(10**17), 32*(10**18),
+    29*(10**19), 21*(10**20), 11*(10**21),
+    94*(10**21), 74*(10**22), 56*(10**23),
+    20*(10**27), 20*(10**32), 20*(10**37),
+    20*(10**42), 20*(10**47), 20*(10**57),
+    20*(10**67), 20*(10**77), 20*(10**87),
+    20*(10**97), 20*(10**117), 20*(10**137),
+    20*(10**157), 20*(10**177), 20*(10**197),
+]
+
+# Example unique names for each tier (customize as desired)
+TIER_NAMES_FLAT = [
+    "Bottle Cap", "Empty Glass Bottle", "Toblerone Bar",
+    "Coca-Cola Bottle", "Breakfast Package", "Stove",
+    "IPhone 15", "Toyota Camry", "Steinway Grand Piano",
+    "Simple Townhouse", "Supercar", "Small Private Island",
+    "Holiday House", "Twitter", "Meta",
+    "Elon Musk", "Vatican", "France",
+    "Russia", "US", "Australia",
+    "Asia", "Earth", "Mars",
+
+    #NEXT PAGE
+    "Inner Solar System", "Jupiter", "Outer Solar System",
+    "Sun", "Heliosphere", "Proxima Centauri",
+    "A Cen System", "Sirius System", "55 Cancri e",
+    "Solar Neighborhood", "Kepler 452b", "Kepler 22b",
+    "TRAPPIST-1d", "TRAPPIST-1 System", "Pistol Star",
+    "Betelgeuse", "Stephenson 2-18", "Orion Arm",
+    "Milky Way", "Messier 87", "IC 1101",
+    "Local Group", "Laniakea Supercluster", "Singularity",
+]
+
+TIER_COSTS_FLAT = [rps * 50 for rps in TIER_RPS_FLAT]
+
+# Prestige unlocks at Tier 33 (index 32)
+PRESTIGE_TIER_INDEX = 32
+
+# get_rps jumps at level 200 and then every 25 levels, up to the cap
+MILESTONE_START = 200
+MILESTONE_STEP = 25
+MILESTONE_CAP = 8000
+
+# get_rps multiplier for each milestone reached (index: see milestone_index), built once
+# from the exact integers: x4 at 200, x4 per 25 levels after, x100 per 1000 levels
+MILESTONE_BONUS = [
+    BigNum(4 * 4 ** i * 100 ** (i * MILESTONE_STEP // 1000))
+    for i in range((MILESTONE_CAP - MILESTONE_START) // MILESTONE_STEP + 1)
+]
+MILESTONE_BONUS_LOG10 = [bonus.log10() for bonus in MILESTONE_BONUS]
+
+# Owning the first level of each of these tiers opens the next arc (Arc II onwards)
+ARC_TIER_INDICES = [10, 16, 23, 33, 43, 47]
+
+
+def milestone_index(level):
+    """Position in MILESTONE_BONUS of the last milestone reached; `level` must be at least MILESTONE_START."""
+    return (min(level, MILESTONE_CAP) - MILESTONE_START) // MILESTONE_STEP
+
+
+def milestone_bonus_log10(level):
+    """log10 of the get_rps multiplier at `level`."""
+    if level < MILESTONE_START:
+        return 0.0
+    return MILESTONE_BONUS_LOG10[milestone_index(level)]
+
+
+def saved_number(value):
+    """
+    BigNum from a save field. Saves from the float era hold Infinity once
+    the number overflowed; that is clamped to the largest float (NaN to 0)
+    so those saves still load.
+    """
+    if isinstance(value, str):
+        try:
+            return BigNum(value)
+        except OverflowError:
+            value = float(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        if math.isnan(value):
+            return BigNum(0)
+        return BigNum(math.copysign(sys.float_info.max, value))
+    return BigNum(value)
+
+
+def _float_column(values=()):
+    return np.array(values, dtype=np.float64) if np is not None else array("d", values)
+
+
+def _int_column(values=()):
+    return np.array(values, dtype=np.int64) if np is not None else array("q", values)
+
+
+class TierCatalog:
+    """
+    Every tier's data stored column by column (struct of arrays).
+
+    Questions about all tiers at once (total RPS, which tiers are affordable,
+    which levels changed) are answered a column at a time, vectorized with
+    NumPy when it is installed. Prices and RPS are compared as log10 floats,
+    so no column ever overflows. Tier objects are views onto a single row for
+    the exact BigNum math of one purchase.
+    """
+
+    def __init__(self, names=(), rps_bases=(), cost_bases=()):
+        self.names = list(names)
+        self.rps_base = [BigNum(value) for value in rps_bases]
+        self.cost_base = [BigNum(value) for value in cost_bases]
+        self.rps_base_log10 = _float_column([value.log10() for value in self.rps_base])
+        self.cost_base_log10 = _float_column([value.log10() for value in self.cost_base])
+        self.levels = _int_column([0] * len(self.names))
+        # log10 of each tier's milestone multiplier at its current level
+        self.bonus_log10 = _float_column([0.0] * len(self.names))
+        self.tiers = [Tier(self, index) for index in range(len(self.names))]
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, rps_base, cost_base):
+        """Append a tier (e.g. a custom one) and return its view."""
+        rps_base = BigNum(rps_base)
+        cost_base = BigNum(cost_base)
+        self.names.append(name)
+        self.rps_base.append(rps_base)
+        self.cost_base.append(cost_base)
+        if np is not None:
+            self.rps_base_log10 = np.append(self.rps_base_log10, rps_base.log10())
+            self.cost_base_log10 = np.append(self.cost_base_log10, cost_base.log10())
+            self.levels = np.append(self.levels, 0)
+            self.bonus_log10 = np.append(self.bonus_log10, 0.0)
+        else:
+            self.rps_base_log10.append(rps_base.log10())
+            self.cost_base_log10.append(cost_base.log10())
+            self.levels.append(0)
+            self.bonus_log10.append(0.0)
+        tier = Tier(self, len(self.tiers))
+        self.tiers.append(tier)
+        return tier
+
+    def set_level(self, index, level):
+        self.levels[index] = level
+        self.bonus_log10[index] = milestone_bonus_log10(level)
+
+    def reset_levels(self):
+        self.levels = _int_column([0] * len(self))
+        self.bonus_log10 = _float_column([0.0] * len(self))
+
+    def copy_levels(self):
+        return self.levels.copy() if np is not None else array("q", self.levels)
+
+    def changed_levels(self, snapshot):
+        """Indices whose level differs from `snapshot` (a copy_levels() result)."""
+        if np is not None:
+            return np.flatnonzero(self.levels != snapshot).tolist()
+        if self.levels == snapshot:
+            return []
+        return [index for index, (level, old) in enumerate(zip(self.levels, snapshot)) if level != old]
+
+    def cost_log10(self):
+        """log10 of every tier's next-level cost."""
+        if np is not None:
+            return self.cost_base_log10 + self.levels * LOG10_COST_GROWTH
+        return [base + level * LOG10_COST_GROWTH for base, level in zip(self.cost_base_log10, self.levels)]
+
+    def rps_log10(self, prestige_multiplier=1.0):
+        """log10 of every tier's get_rps(); -inf for tiers with no levels."""
+        offset = math.log10(prestige_multiplier)
+        if np is not None:
+            with np.errstate(divide="ignore"):
+                return self.rps_base_log10 + np.log10(self.levels) + self.bonus_log10 + offset
+        return [
+            base + math.log10(level) + bonus + offset if level > 0 else -math.inf
+            for base, level, bonus in zip(self.rps_base_log10, self.levels, self.bonus_log10)
+        ]
+
+    def affordable(self, resource):
+        """Per tier: can `resource` pay for its next level?"""
+        resource = BigNum(resource)
+        budget = resource.log10() if resource > 0 else -math.inf
+        costs = self.cost_log10()
+        if np is not None:
+            return costs <= budget
+        return [cost <= budget for cost in costs]
+
+    def total_rps(self, prestige_multiplier=1.0):
+        """Sum of every tier's get_rps(), added up in log space."""
+        values = self.rps_log10(prestige_multiplier)
+        if np is not None:
+            values = values[self.levels > 0]
+            if not len(values):
+                return BigNum(0)
+            top = values.max()
+            return BigNum.from_log10(float(top + np.log10(np.sum(10.0 ** (values - top)))))
+        values = [value for value in values if value != -math.inf]
+        if not values:
+            return BigNum(0)
+        top = max(values)
+        return BigNum.from_log10(top + math.log10(math.fsum(10.0 ** (value - top) for value in values)))
+
+    def total_levels(self):
+        return int(self.levels.sum()) if np is not None else sum(self.levels)
+
+    def highest_owned(self):
+        """Highest index with at least one level, or -1."""
+        if np is not None:
+            owned = np.flatnonzero(self.levels)
+            return int(owned[-1]) if len(owned) else -1
+        return next((index for index in range(len(self) - 1, -1, -1) if self.levels[index]), -1)
+
+    def cheapest(self, count):
+        """Index of the cheapest next level among the first `count` tiers."""
+        costs = self.cost_log10()
+        if np is not None:
+            return int(np.argmin(costs[:count]))
+        return min(range(count), key=costs.__getitem__)
+
+
+class Tier:
+    """One purchasable tier: a view onto its row of a TierCatalog."""
+
+    def __init__(self, catalog, index):
+        self.catalog = catalog
+        self.index = index
+        # Next-level cost, remembered for the level it was computed at
+        self._cost_level = None
+        self._cost = None
+
+    @property
+    def name(self):
+        return self.catalog.names[self.index]
+
+    @property
+    def level(self):
+        return int(self.catalog.levels[self.index])
+
+    @level.setter
+    def level(self, level):
+        self.catalog.set_level(self.index, level)
+
+    @property
+    def rps_base(self):
+        return self.catalog.rps_base[self.index]
+
+    @property
+    def cost_base(self):
+        return self.catalog.cost_base[self.index]
+
+    @property
+    def rps_base_log10(self):
+        return float(self.catalog.rps_base_log10[self.index])
+
+    @property
+    def cost_base_log10(self):
+        return float(self.catalog.cost_base_log10[self.index])
+
+    def get_cost(self):
+        if self._cost_level != self.level:
+            self._cost = self.cost_base * BIG_COST_GROWTH ** self.level
+            self._cost_level = self.level
+        return self._cost
+
+    def get_cost_log10(self):
+        # Cheap float for ranking tiers by price
+        return self.cost_base_log10 + self.level * LOG10_COST_GROWTH
+
+    def get_bulk_cost(self, count):
+        # Sum of the next `count` level costs (geometric series)
+        if count == 1:
+            return self.get_cost()
+        return self.get_cost() * (BIG_COST_GROWTH ** count - 1) / (COST_GROWTH - 1)
+
+    def get_max_affordable(self, resources, limit=None):
+        """How many levels `resources` can buy in one go, optionally capped at `limit`."""
+        cost = self.get_cost()
+        if resources < cost:
+            return 0
+        affordable_ratio = resources * (COST_GROWTH - 1) / cost + 1
+        count = int(affordable_ratio.log10() / math.log10(COST_GROWTH))
+        if limit is not None:
+            count = min(count, limit)
+        # Correct for float rounding at the boundary in either direction
+        while count > 1 and self.get_bulk_cost(count) > resources:
+            count -= 1
+        while (limit is None or count < limit) and self.get_bulk_cost(count + 1) <= resources:
+            count += 1
+        return max(count, 1)
+
+    def get_rps(self, prestige_multiplier=1.0):
+        level = self.level
+        rps = self.rps_base * level
+        if level >= MILESTONE_START:
+            rps *= MILESTONE_BONUS[milestone_index(level)]
+        rps *= prestige_multiplier
+        return rps
+
+
+def levels_to_next_milestone(level):
+    """Levels to buy before get_rps next jumps, or None once past the cap."""
+    if level < MILESTONE_START:
+        return MILESTONE_START - level
+    if level >= MILESTONE_CAP:
+        return None
+    return MILESTONE_STEP - (level - MILESTONE_START) % MILESTONE_STEP
+
+
+def buy_cheapest(state):
+    """
+    fast_forward policy: always buy the cheapest unlocked tier.
+
+    Takes every level affordable right away in one purchase, but never runs
+    past the tier's next milestone, so each RPS jump is its own event.
+    """
+    unlocked = min(state.highest_owned + 2, len(state.tiers))
+    if not unlocked:
+        return None
+    best = state.catalog.cheapest(unlocked)
+    tier = state.tiers[best]
+    if state.resource < tier.get_cost():
+        return best, 1
+    return best, tier.get_max_affordable(state.resource, levels_to_next_milestone(tier.level))
+
+
+class ChunkedBuyer:
+    """
+    buy_cheapest, but waits to buy `levels` at a time (never past a milestone).
+
+    Plays almost as well as buying level by level once income is large, with
+    a fraction of the purchase events, which is what makes long runs (and
+    long offline stretches) cheap.
+    """
+
+    def __init__(self, levels=10):
+        self.levels = levels
+
+    def __call__(self, state):
+        choice = buy_cheapest(state)
+        if choice is None:
+            return None
+        index, count = choice
+        to_milestone = levels_to_next_milestone(state.tiers[index].level) or MILESTONE_STEP
+        return index, max(count, min(to_milestone, self.levels))
+
+
+def create_catalog():
+    return TierCatalog(TIER_NAMES_FLAT, TIER_RPS_FLAT, TIER_COSTS_FLAT)
+
+
+class GameState:
+    """All economy state of one player, advanced with tick(seconds)."""
+
+    def __init__(self):
+        self.catalog = create_catalog()
+        self.tiers = self.catalog.tiers
+        self.prestige_points = 0
+        self.prestige_multiplier = 1.0
+        self.super_multiplier = 1.0      # cumulative super multiplier
+        self.total_rps = BigNum(0)
+        self.resource = BigNum(0)
+        self.total_ascensions_this_transcendence = 0
+        self.total_transcendences = 0
+
+        # Aggregates kept in step with tier levels, so per-frame reads stay O(1)
+        self.total_levels = 0
+        self.highest_owned = -1   # highest tier index with level > 0
+        self.arc_index = 0        # 0 = Arc I, one more per ARC_TIER_INDICES entry reached
+
+    # --- Ticking and purchases ---
+
+    def tick(self, seconds):
+        self.resource += self.total_rps * seconds
+
+    def is_unlocked(self, index):
+        # Tiers are bought in order, so everything up to one past the highest owned tier is open
+        return 0 <= index <= self.highest_owned + 1 and index < len(self.tiers)
+
+    def get_tier_rps(self, index):
+        return self.tiers[index].get_rps(self.prestige_multiplier)
+
+    def buy(self, index, limit=None):
+        """Buy up to `limit` levels of a tier (all affordable if None). Returns levels bought."""
+        if not self.is_unlocked(index):
+            return 0
+        tier = self.tiers[index]
+        count = tier.get_max_affordable(self.resource, limit)
+        if count > 0:
+            self.resource -= tier.get_bulk_cost(count)
+            prev_rps = tier.get_rps(self.prestige_multiplier)
+            tier.level += count
+            new_rps = tier.get_rps(self.prestige_multiplier)
+            self.total_rps += (new_rps - prev_rps)
+            self.total_levels += count
+            if index > self.highest_owned:
+                self.highest_owned = index
+                self.arc_index = bisect_right(ARC_TIER_INDICES, index)
+        return count
+
+    def get_click_value(self):
+        click_value = 0.01
+        if self.tiers[0].level > 0:
+            click_value += self.total_rps * 0.1
+        return click_value
+
+    def click(self):
+        click_value = self.get_click_value()
+        self.resource += click_value
+        return click_value
+
+    def recompute_aggregates(self):
+        """Rebuild total_levels, highest_owned and arc_index after levels were set directly."""
+        self.total_levels = self.catalog.total_levels()
+        self.highest_owned = self.catalog.highest_owned()
+        self.arc_index = bisect_right(ARC_TIER_INDICES, self.highest_owned)
+
+    def recompute_total_rps(self):
+        self.total_rps = self.catalog.total_rps(self.prestige_multiplier)
+
+    def fast_forward(self, seconds, policy=None, income_only=False):
+        """
+        Advance `seconds` of game time without stepping ticks.
+
+        Income is linear between purchases, so with no policy this is one
+        multiply. With a policy, `policy(state)` names the next purchase as
+        (tier_index, levels) or None to stop buying; the clock jumps straight
+        to when that purchase becomes affordable, buys it (picking up any
+        milestone bonus through get_rps) and carries on at the new RPS.
+        With `income_only`, purchases only spend what was earned during these
+        seconds, never the resource there was before.
+        Returns (resource earned, purchases made, resource spent).
+        """
+        earned = BigNum(0)
+        spent = BigNum(0)
+        purchases = 0
+        remaining = float(seconds)
+        while policy is not None and remaining > 0:
+            choice = policy(self)
+            if choice is None:
+                break
+            index, count = choice
+            cost = self.tiers[index].get_bulk_cost(count)
+            # With income_only, only the unspent part of what was earned here can pay
+            budget_limited = income_only and earned - spent < self.resource
+            available = earned - spent if budget_limited else self.resource
+            if available < cost:
+                if not self.total_rps:
+                    break
+                wait = float((cost - available) / self.total_rps)
+                if wait > remaining:
+                    break
+                earned += cost - available
+                remaining -= wait
+                # Land exactly on the price instead of a rounding error below it
+                self.resource = self.resource + (cost - available) if budget_limited else cost
+            if self.buy(index, count) == 0:
+                break
+            spent += cost
+            purchases += 1
+
+        gain = self.total_rps * remaining
+        self.resource += gain
+        earned += gain
+        return earned, purchases, spent
+
+    # --- Prestige ---
+
+    def calculate_prestige_gain(self):
+        return int(self.total_levels * 1)
+
+    def can_prestige(self):
+        return self.tiers[PRESTIGE_TIER_INDEX].level > 0
+
+    def apply_prestige(self):
+        if not self.can_prestige():
+            return
+        base_gain = self.calculate_prestige_gain()
+        if base_gain == 0:
+            return
+        # Apply super multiplier to prestige gain
+        gained = int(base_gain * self.super_multiplier)
+        self.prestige_points += gained
+        self.prestige_multiplier = 1.0 + self.prestige_points * 0.01
+
+        self.reset_tiers()
+        self.total_ascensions_this_transcendence += 1
+
+    def can_super_prestige(self):
+        # Can only super prestige if the player has at least 1 prestige point
+        return self.prestige_points >= 1
+
+    def apply_super_prestige(self):
+        if not self.can_super_prestige():
+            return
+        # Each prestige point gives 0.001 to super multiplier
+        self.super_multiplier += self.prestige_points * 0.001
+
+        # Reset prestige points and multiplier
+        self.prestige_points = 0
+        self.prestige_multiplier = 1.0
+
+        # Also fully reset the game state (all tiers, resources, RPS)
+        self.reset_tiers()
+        self.total_transcendences += 1
+        self.total_ascensions_this_transcendence = 0  # reset ascensions for the new cycle
+
+    def reset_tiers(self):
+        self.catalog.reset_levels()
+        self.total_rps = BigNum(0)
+        self.resource = BigNum(0)
+        self.recompute_aggregates()
+
+    # --- Save data ---
+
+    def to_dict(self, now):
+        """The economy part of the save file (see IdleGame.save_game)."""
+        return {
+            "resource": self.resource.to_json(),
+            "total_rps": self.total_rps.to_json(),
+            "prestige_points": self.prestige_points,
+            "prestige_multiplier": self.prestige_multiplier,
+            "super_multiplier": self.super_multiplier,
+            "button_levels": [tier.level for tier in self.tiers],
+            "save_time": now,
+            "total_ascensions_this_transcendence": self.total_ascensions_this_transcendence,
+            "total_transcendences": self.total_transcendences,
+        }
+
+    def load_dict(self, data, now, policy=None):
+        """
+        Restore from save data and award offline gain for the time since
+        "save_time", auto-buying with `policy` if given (see fast_forward).
+        Auto-buying only spends the offline gain, never the saved resource.
+        Returns (offline_gain, elapsed_seconds, spent_on_purchases).
+        """
+        saved_resource = saved_number(data.get("resource", 0.0))
+        saved_rps = saved_number(data.get("total_rps", 0.0))
+        saved_time = data.get("save_time", now)
+
+        elapsed = max(0.0, now - saved_time)
+
+        self.resource = saved_resource
+        self.prestige_points = data.get("prestige_points", 0)
+        self.prestige_multiplier = data.get("prestige_multiplier", 1.0)
+        self.super_multiplier = data.get("super_multiplier", 1.0)
+        self.total_ascensions_this_transcendence = data.get("total_ascensions_this_transcendence", 0)
+        self.total_transcendences = data.get("total_transcendences", 0)
+
+        # Restore tier levels if they match
+        saved_levels = data.get("button_levels", [])
+        if len(saved_levels) == len(self.tiers):
+            for tier, lvl in zip(self.tiers, saved_levels):
+                tier.level = lvl
+            # Recompute total_rps and the level aggregates now that levels are back
+            self.recompute_total_rps()
+            self.recompute_aggregates()
+        else:
+            print("Saved button count does not match current button count; skipping level restore.")
+            self.total_rps = BigNum(0)
+
+        spent = BigNum(0)
+        if policy is None:
+            offline_gain = saved_rps * elapsed
+            self.resource += offline_gain
+        else:
+            offline_gain, _, spent = self.fast_forward(elapsed, policy, income_only=True)
+        return offline_gain, elapsed, spent
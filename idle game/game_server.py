@@ -0,0 +1,363 @@
+"""
+Headless multi-session server: many players' economies in one process.
+
+Sessions are GameStates advanced together by one batched tick, and driven by
+newline-delimited JSON commands over a local TCP socket:
+
+    {"session": "alice", "cmd": "buy", "tier": 0, "count": 10}
+    {"session": "alice", "cmd": "click"}
+    {"session": "alice", "cmd": "ascend"}          (also "transcend", "state", "save", "close")
+    {"cmd": "stats"}
+
+Sessions are saved in the same format as the game's own save file (see
+IdleGame.save_game), one file per session, including offline gain on load.
+
+    python game_server.py serve --port 8765
+    python game_server.py loadgen --port 8765 --sessions 2000 --duration 10
+    python game_server.py bench --sessions 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import signal
+import tempfile
+import threading
+import time
+
+from bignum import BigNum
+from economy import GameState
+from savefile import read_save, write_save
+
+TICK_RATE = 1.0          # batched ticks per second
+AUTOSAVE_INTERVAL = 30.0
+DEFAULT_PORT = 8765
+SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")   # also its save file name
+
+
+class Session:
+    """One player's economy plus the UI fields the save format carries."""
+
+    def __init__(self, session_id, now):
+        self.id = session_id
+        self.state = GameState()
+        self.current_multiplier_index = 0
+        self.current_page = 0
+        self.last_tick = now
+        self.dirty = False
+
+    def settle(self, now):
+        """Pay out income up to `now`."""
+        if self.state.total_rps:
+            self.state.tick(now - self.last_tick)
+        self.last_tick = now
+
+    def get_save_data(self, now):
+        # Same fields as IdleGame.get_save_data, so the game can open server saves and vice versa
+        data = self.state.to_dict(now)
+        data["current_multiplier_index"] = self.current_multiplier_index
+        data["current_page"] = self.current_page
+        return data
+
+    def summary(self):
+        state = self.state
+        return {
+            "resource": state.resource.to_json(),
+            "total_rps": state.total_rps.to_json(),
+            "prestige_points": state.prestige_points,
+            "super_multiplier": state.super_multiplier,
+            "levels": [tier.level for tier in state.tiers[:state.highest_owned + 2]],
+        }
+
+
+class SessionManager:
+    """All live sessions, the batched tick and the command handlers."""
+
+    def __init__(self, save_dir):
+        self.save_dir = save_dir
+        self.sessions = {}
+        self.ticks = 0
+        self.sessions_ticked = 0
+        self.tick_seconds = 0.0
+        # Every snapshot gets the next generation; a write is dropped if its file
+        # already holds a later one, so a slow autosave can't undo a "save" or "close"
+        self.generation = 0
+        self.written = {}        # path: generation on disk
+        self.write_locks = {}    # path: lock held while that file is written
+        self.write_locks_lock = threading.Lock()
+        os.makedirs(save_dir, exist_ok=True)
+
+    def save_path(self, session_id):
+        return os.path.join(self.save_dir, f"{session_id}.dat")
+
+    def open(self, session_id, now):
+        session = self.sessions.get(session_id)
+        if session is not None:
+            return session
+        if not SESSION_ID.match(session_id):
+            raise ValueError(f"bad session id {session_id!r}")
+        session = Session(session_id, now)
+        path = self.save_path(session_id)
+        if os.path.exists(path):
+            data = read_save(path)
+            session.state.load_dict(data, now)
+            session.current_multiplier_index = data.get("current_multiplier_index", 0)
+            session.current_page = data.get("current_page", 0)
+        self.sessions[session_id] = session
+        return session
+
+    def tick(self, now):
+        """Settle every session up to `now` in one pass. Returns how many were ticked."""
+        started = time.perf_counter()
+        for session in self.sessions.values():
+            session.settle(now)
+        self.ticks += 1
+        self.sessions_ticked += len(self.sessions)
+        self.tick_seconds += time.perf_counter() - started
+        return len(self.sessions)
+
+    def stats(self):
+        return {
+            "sessions": len(self.sessions),
+            "ticks": self.ticks,
+            "sessions_ticked": self.sessions_ticked,
+            "sessions_ticked_per_second": self.sessions_ticked / self.tick_seconds if self.tick_seconds else 0.0,
+        }
+
+    def snapshot(self, session, now):
+        """(path, generation, save data) of one session, for write_saves."""
+        session.settle(now)
+        session.dirty = False
+        self.generation += 1
+        return self.save_path(session.id), self.generation, session.get_save_data(now)
+
+    def dirty_snapshots(self, now):
+        """Snapshots of every session changed since the last one was taken."""
+        return [self.snapshot(session, now) for session in self.sessions.values() if session.dirty]
+
+    def write_saves(self, snapshots):
+        """Write snapshots unless their file already holds a later one. Safe from any thread."""
+        for path, generation, data in snapshots:
+            with self.write_locks_lock:
+                lock = self.write_locks.setdefault(path, threading.Lock())
+            with lock:
+                if generation <= self.written.get(path, 0):
+                    continue
+                try:
+                    write_save(path, data)
+                    self.written[path] = generation
+                except Exception as e:
+                    print("Error saving session:", path, e)
+
+    def handle(self, request, now):
+        """Run one command and return the response dict."""
+        command = request.get("cmd")
+        if command == "stats":
+            return {"ok": True, **self.stats()}
+
+        session = self.open(str(request.get("session", "")), now)
+        # Commands see income up to this moment, not just up to the last batched tick
+        session.settle(now)
+        state = session.state
+        result = None
+        if command == "buy":
+            count = request.get("count")
+            result = state.buy(int(request["tier"]), None if count is None else int(count))
+        elif command == "click":
+            # A click never changes RPS, so any number of them is one multiply, not a loop on the event loop
+            count = max(0, int(request.get("count", 1)))
+            earned = BigNum(state.get_click_value()) * count
+            state.resource += earned
+            result = earned.to_json()
+        elif command == "ascend":
+            state.apply_prestige()
+        elif command == "transcend":
+            state.apply_super_prestige()
+        elif command == "save":
+            self.write_saves([self.snapshot(session, now)])
+        elif command == "close":
+            self.write_saves([self.snapshot(session, now)])
+            del self.sessions[session.id]
+            return {"ok": True, "session": session.id}
+        elif command != "state":
+            raise ValueError(f"unknown command {command!r}")
+        if command not in ("state", "save"):
+            session.dirty = True
+        return {"ok": True, "session": session.id, "result": result, **session.summary()}
+
+
+# --- Server ---
+
+async def tick_loop(manager, tick_rate):
+    interval = 1.0 / tick_rate
+    while True:
+        await asyncio.sleep(interval)
+        manager.tick(time.time())
+
+
+async def autosave_loop(manager, interval):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        # Snapshots are built here on the loop; compressing and writing happens on a worker thread
+        snapshots = manager.dirty_snapshots(time.time())
+        if snapshots:
+            await loop.run_in_executor(None, manager.write_saves, snapshots)
+
+
+async def handle_client(manager, reader, writer):
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                response = manager.handle(json.loads(line), time.time())
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port, save_dir, tick_rate):
+    manager = SessionManager(save_dir)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass   # Windows: Ctrl+C still arrives as KeyboardInterrupt
+    server = await asyncio.start_server(lambda r, w: handle_client(manager, r, w), host, port)
+    print(f"Serving on {host}:{port}, saving sessions to {save_dir}/")
+    tasks = [
+        asyncio.create_task(tick_loop(manager, tick_rate)),
+        asyncio.create_task(autosave_loop(manager, AUTOSAVE_INTERVAL)),
+    ]
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Final save of everything still in memory; an autosave still running can't overwrite it
+        now = time.time()
+        manager.write_saves([manager.snapshot(session, now) for session in manager.sessions.values()])
+        print(f"Saved {len(manager.sessions)} sessions.")
+
+
+# --- Load generator ---
+
+async def loadgen_client(host, port, session_ids, deadline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            session_id = random.choice(session_ids)
+            roll = random.random()
+            if roll < 0.6:
+                request = {"session": session_id, "cmd": "click"}
+            elif roll < 0.95:
+                request = {"session": session_id, "cmd": "buy", "tier": random.randrange(4), "count": 1}
+            else:
+                request = {"session": session_id, "cmd": "state"}
+            started = time.perf_counter()
+            writer.write(json.dumps(request).encode("utf-8") + b"\n")
+            await writer.drain()
+            await reader.readline()
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def request_once(host, port, request):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps(request).encode("utf-8") + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+
+async def loadgen(host, port, sessions, connections, duration):
+    session_ids = [f"load-{i}" for i in range(sessions)]
+    # Open every session first so the tick covers all of them for the whole run
+    for i in range(0, sessions, 500):
+        await asyncio.gather(*(request_once(host, port, {"session": s, "cmd": "state"})
+                               for s in session_ids[i:i + 500]))
+    before = await request_once(host, port, {"cmd": "stats"})
+
+    latencies = []
+    deadline = time.perf_counter() + duration
+    groups = [session_ids[i::connections] for i in range(connections)]
+    await asyncio.gather(*(loadgen_client(host, port, group, deadline, latencies) for group in groups if group))
+
+    after = await request_once(host, port, {"cmd": "stats"})
+    latencies.sort()
+    ticked = after["sessions_ticked"] - before["sessions_ticked"]
+    print(f"{len(latencies)} commands in {duration:g}s over {connections} connections: "
+          f"{len(latencies) / duration:.0f} commands/s")
+    print(f"latency ms  p50 {latencies[len(latencies) // 2] * 1000:.2f}  "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f}")
+    print(f"server: {after['sessions']} sessions, {ticked} session ticks during the run, "
+          f"{after['sessions_ticked_per_second']:.0f} sessions ticked per second of tick time")
+
+
+# --- In-process tick benchmark ---
+
+def bench(sessions, ticks):
+    """Time the batched tick alone, no sockets, with every session earning."""
+    with tempfile.TemporaryDirectory() as save_dir:
+        manager = SessionManager(save_dir)
+        now = time.time()
+        for i in range(sessions):
+            session = manager.open(f"bench-{i}", now)
+            session.state.resource = session.state.tiers[0].get_cost() * 10
+            session.state.buy(0, random.randint(1, 5))
+        for _ in range(ticks):
+            now += 1.0 / TICK_RATE
+            manager.tick(now)
+        stats = manager.stats()
+    print(f"{sessions} sessions x {ticks} ticks: {stats['sessions_ticked_per_second']:.0f} sessions ticked per second")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    serve_parser = sub.add_parser("serve", help="run the server")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--save-dir", default="sessions")
+    serve_parser.add_argument("--tick-rate", type=float, default=TICK_RATE)
+
+    loadgen_parser = sub.add_parser("loadgen", help="drive a running server with synthetic players")
+    loadgen_parser.add_argument("--host", default="127.0.0.1")
+    loadgen_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    loadgen_parser.add_argument("--sessions", type=int, default=1000)
+    loadgen_parser.add_argument("--connections", type=int, default=32)
+    loadgen_parser.add_argument("--duration", type=float, default=10.0)
+
+    bench_parser = sub.add_parser("bench", help="time the batched tick in-process")
+    bench_parser.add_argument("--sessions", type=int, default=10000)
+    bench_parser.add_argument("--ticks", type=int, default=20)
+
+    args = parser.parse_args()
+    if args.mode == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.save_dir, args.tick_rate))
+        except KeyboardInterrupt:
+            pass
+    elif args.mode == "loadgen":
+        asyncio.run(loadgen(args.host, args.port, args.sessions, args.connections, args.duration))
+    else:
+        bench(args.sessions, args.ticks)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,71 @@
+import math
 import pygame
 import sys
 import time
-import json
 import os   # for checking file existence
+from collections import deque
+from functools import partial
+
+from assets import AssetManager
+from bignum import BigNum
+from economy import GameState, TIER_NAMES_FLAT, TIERS_PER_PAGE
+from journal import ASCEND, BUY, CLICK, MULTIPLIER, PAGE, TRANSCEND, ActionJournal, replay
+from milestones import MilestoneEngine, create_milestones, unlocks_by_tier
+from number_format import NUMBER_FORMAT_TOOLTIP, format_number, next_notation
+from optimizer import PaybackOptimizer
+from profiler import FrameProfiler, StartupProfile
+from savefile import Autosaver, read_save, write_save
+from simulation import FixedStepSimulation
+from stats import RESOLUTIONS, StatsRecorder, value_range
+from dirty_renderer import DirtyRenderer, Widget, draw_border
+from surface_cache import TextCache, TooltipCache
 
 # Constants
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 800
 FPS = 60
+IDLE_FPS = 5         # frame rate while the window is unfocused and untouched
+IDLE_AFTER = 2.0     # seconds without input before dropping to IDLE_FPS
+TICK_RATE = 30       # economy steps per second, independent of the frame rate
+IDLE_TICK_RATE = 1   # economy steps per second while idle
+NOTATION_KEY = pygame.K_F2   # cycles suffix / engineering / scientific number notation
+PROFILER_KEY = pygame.K_F3   # toggles the frame profiler overlay
+PROFILER_REFRESH = 0.5       # seconds between overlay text updates
+STATS_KEY = pygame.K_F4      # cycles the history graph: per second, per minute, per hour, off
+STATS_INTERVAL = 1.0         # seconds between history samples
+STATS_RECT = pygame.Rect(50, 120, 620, 280)
+STATS_TITLES = {"second": "Last 10 minutes", "minute": "Last 24 hours", "hour": "Last 90 days"}
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GREEN = (100, 255, 100)
 RED = (255, 100, 100)
 GRAY = (180, 180, 180)
-
-# Tier base RPS and base cost
-TIER_RPS_FLAT = [
-    0.01, 0.08, 0.6,
-    4, 33, 150,
-    940, 8700, 64000,
-    510000, 44*(10**5), 32*(10**6),
-    24*(10**7), 11*(10**8), 90*(10**8),
-    62*(10**9), 32*(10**10), 13*(10**11),
-    84*(10**11), 63*(10**12), 34*(10**13),
-    21*(10**14), 19*(10**15), 93*(10**15),
-
-    #NEXT PAGE
-    63*(10**16), 42*(10**17), 32*(10**18),
-    29*(10**19), 21*(10**20), 11*(10**21),
-    94*(10**21), 74*(10**22), 56*(10**23),
-    20*(10**27), 20*(10**32), 20*(10**37),
-    20*(10**42), 20*(10**47), 20*(10**57),
-    20*(10**67), 20*(10**77), 20*(10**87),
-    20*(10**97), 20*(10**117), 20*(10**137),
-    20*(10**157), 20*(10**177), 20*(10**197),
+GOLD = (255, 200, 0)   # border of the optimizer's recommended next buy
+
+# Background, text color and title of each arc, indexed by GameState.arc_index
+ARCS = [
+    ("default", BLACK, "Arc I: Personal Items"),
+    ("mansion", BLACK, "Arc II: Luxuries"),
+    ("earth", WHITE, "Arc III: Power"),
+    ("nebula", WHITE, "Arc IV: Solar Neighborhood"),
+    ("galaxy", WHITE, "Arc V: Galactic Structures"),
+    ("supercluster", WHITE, "Arc VI: Beyond Comprehension"),
+    ("black", WHITE, "Arc VII: The Singularity"),
 ]
 
-# Example unique names for each tier (customize as desired)
-TIER_NAMES_FLAT = [
-    "Bottle Cap", "Empty Glass Bottle", "Toblerone Bar", 
-    "Coca-Cola Bottle", "Breakfast Package", "Stove", 
-    "IPhone 15", "Toyota Camry", "Steinway Grand Piano",
-    "Simple Townhouse", "Supercar", "Small Private Island",
-    "Holiday House", "Twitter", "Meta",
-    "Elon Musk", "Vatican", "France",
-    "Russia", "US", "Australia",
-    "Asia", "Earth", "Mars",
-
-    #NEXT PAGE
-    "Inner Solar System", "Jupiter", "Outer Solar System",
-    "Sun", "Heliosphere", "Proxima Centauri",
-    "A Cen System", "Sirius System", "55 Cancri e",
-    "Solar Neighborhood", "Kepler 452b", "Kepler 22b",
-    "TRAPPIST-1d", "TRAPPIST-1 System", "Pistol Star",
-    "Betelgeuse", "Stephenson 2-18", "Orion Arm",
-    "Milky Way", "Messier 87", "IC 1101",
-    "Local Group", "Laniakea Supercluster", "Singularity",
-]
+# Image for each background above; None is plain black. The .jpg copies next to them are much smaller.
+BACKGROUND_FILES = {
+    "default": "piggy_bank.png",
+    "mansion": "mansion.png",
+    "earth": "earth.png",
+    "nebula": "nebula.png",
+    "galaxy": "galaxy.png",
+    "supercluster": "supercluster.png",
+    "black": None,
+}
+
+# Purchase multiplier entry that buys as many levels as the player can afford
+BUY_MAX = "Max"
 
 TOOLTIPS = {
     "Bottle Cap": "Once lost beneath your couch cushions, now the seed of an empire. Every fortune starts somewhere.",
@@ -69,20 +78,20 @@ TOOLTIPS = {
     "Toyota Camry": "A standard-body sedan to bring you everyday. Nothing special about it.",
     "Steinway Grand Piano": "Now you're making a statement! This large instrument plays 'rich vibes' to the entire living room!",
     "Simple Townhouse": "Real Estate has a very high income potential. You made your first move investing there. Tiny, but wait for its returns.",
-    "Supercar": "This powerful car doesn't just bring you anywhere fast. Its engine, top speed and bodywork commands attention and prestige. [Unlocks Luxuries Arc]",
+    "Supercar": "This powerful car doesn't just bring you anywhere fast. Its engine, top speed and bodywork commands attention and prestige.",
     "Small Private Island": "Why rent an apartment when you can own this chunk of land? Now you don't have to pay rent! The rent pays you!",
     "Holiday House": "Rebekah Harkness once owned this house. Taylor Swift purchased it and referenced it in 'The Last Great American Dynasty'. Later, you bought this house, and your real estate inflow skyrocketed.",
     "Twitter": "This large social media network also happens to be one of the most notorious echo chambers — filtering out all other opinions to ensure that only what is seen as correct passes through.",
     "Meta": "This Tech Titan owns both doomscrolling Instagram reels and your mom’s Minion memes. Known for Instagram and Facebook reels. A technological powerhouse that competes with Twitter.",
     "Elon Musk": "Your dream has finally come to this moment — out-earning the richest person in the world. You out-earned so hard that you 'bought' him. Now he generates income for you.",
-    "Vatican": "However, your hunger for income becomes so insatiable that you proceeded to 'buy' countries now, and this tiny little country inside Rome is the first victim of your relentless pursuit. Now the church bends to your will. [Unlocks Power Arc]",
+    "Vatican": "However, your hunger for income becomes so insatiable that you proceeded to 'buy' countries now, and this tiny little country inside Rome is the first victim of your relentless pursuit. Now the church bends to your will.",
     "France": "A country of beautiful fashion, really good food and of course, baguettes. Not the biggest country, but the richest in culture.",
     "Russia": "The biggest country, and it's really cold — so cold that it thwarted invaders twice. Even though it is not the richest country today, it used to be the USSR, and that's why you invest on it.",
     "US": "The richest country overall, has Fort Knox, New York and has the most advanced military and technology in the world. A global influence, it exerts power through its interventions. The other side of the Cold War, and way richer than the USSR.",
     "Australia": "Filled with spiders, kangaroos and emus, this is your first continental acquisition yet.",
     "Asia": "With this acquisition, you owned half of civilization itself. The biggest of all continents, this sets the stage of what would be your best acquisition yet.",
     "Earth": "Your best acquisition yet. The Blue Marble and everything inside it, all yours.",
-    "Mars": "Musk dreamed of going to the Red Marble, and you didn't just take it, but made it earn for you. [Unlocks Solar Neighborhood Arc]",
+    "Mars": "Musk dreamed of going to the Red Marble, and you didn't just take it, but made it earn for you.",
     "Inner Solar System": "Venus and Mercury joined your investment portfolio. At this point, you transcended Earth and are now acquiring planets.",
     "Jupiter": "Jupiter is the largest planet in the Solar System... and it's now earning for you.",
     "Outer Solar System": "Saturn, Uranus and Neptune joined your portfolio. Now you have all the planets within reach, earning for you.",
@@ -91,8 +100,8 @@ TOOLTIPS = {
     "Proxima Centauri": "Your investment portfolio now extends to stars too, and being the closest one, it becomes the first victim of your infinitely relentless acquisitions.",
     "A Cen System": "Why own Proxima when you can own its entire system?",
     "Sirius System": "The brightest star in the sky, that is slightly further out than A Cen, is white and hot, and also has a husk of a massive star, is yours now.",
-    "55 Cancri e": "This is an interesting exoplanet because it happens to be made of highly compressed carbon. And compressed carbon = DIAMONDS. Since this planet is diamonds, you want to make it earn for you — which is really immense if you think about it. [Unlocks Ascension]",
-    "Solar Neighborhood": "Every star within 100 light years of you, now yours to earn. [Unlocks Galactic Structures Arc]",
+    "55 Cancri e": "This is an interesting exoplanet because it happens to be made of highly compressed carbon. And compressed carbon = DIAMONDS. Since this planet is diamonds, you want to make it earn for you — which is really immense if you think about it.",
+    "Solar Neighborhood": "Every star within 100 light years of you, now yours to earn.",
     "Kepler 452b": "Earth 2.0. You decided to acquire 'Earth' again — this time, older, wiser, and orbiting a sun that's 1.5 billion years older.",
     "Kepler 22b": "This is basically Earth Pro™. 2x the size of Earth, 4 times heavier, and yes, a lot more ocean.",
     "TRAPPIST-1d": "Earth-sized exoplanet, part of a mini-solar-system. Although it is in the habitable zone, it is tidally locked — which means that daytime is a desert and nighttime is a frozen wasteland.",
@@ -102,7 +111,7 @@ TOOLTIPS = {
     "Stephenson 2-18": "This supergiant makes Betelgeuse look like a baseball. This beast is bigger than Saturn's orbit.",
     "Orion Arm": "You now own a full segment of the Milky Way, your home galaxy. Every star in it, now earns for you.",
     "Milky Way": "Why own a segment when you can own the ENTIRE galaxy? Now every single star and Sagittarius A now bows down to you.",
-    "Messier 87": "Your portfolio now extends to whole galaxies too, and Messier 87 is one of them... being the site of the first black hole pictured. [Unlocks Beyond Comprehension Arc]",
+    "Messier 87": "Your portfolio now extends to whole galaxies too, and Messier 87 is one of them... being the site of the first black hole pictured.",
     "IC 1101": "You acquire a titan of galaxies. Being a really large elliptical galaxy consisting of some of the Universe's oldest stars ever.",
     "Local Group": "Every nearby galaxy: Andromeda, Triangulum, Large and Small Magellanic Clouds — all now earn for you.",
     "Laniakea Supercluster": "Your home cluster of over 100,000 galaxies spanning 520 million light years. So unfathomably big that its paycheck is also unfathomable as well — and you now own it.",
@@ -119,254 +128,255 @@ TOOLTIPS["Transcend"] = (
     "1 Ascension Point = +0.001TP"
 )
 
-NUMBER_FORMAT_TOOLTIP = (
-    "M = Million\n"
-    "B = Billion\n"
-    "T = Trillion\n"
-    "Qa = Quadrillion\n"
-    "Qi = Quintillion\n"
-    "Sx = Sextillion\n"
-    "Sp = Septillion\n"
-    "Oc = Octillion\n"
-    "No = Nonillion\n"
-    "Dc = Decillion\n"
-    "Ud = Undecillion\n"
-    "Dd = Duodecillion\n"
-    "Td = Tredecillion\n"
-    "Qad = Quattuordecillion\n"
-    "Qid = Quindecillion\n"
-    "Sxd = Sexdecillion\n"
-    "Spd = Septendecillion\n"
-    "Ocd = Octodecillion\n"
-    "Nod = Novemdecillion\n"
-    "Vi = Vigintillion\n"
-    "e+XX = Scientific Notation"
-)
+# Unlocks and achievements (see milestones.py). The "[Unlocks ...]" notes come from the unlock milestones,
+# except on the last tier, whose tooltip already ends with its own note.
+MILESTONES = create_milestones()
+for tier, titles in unlocks_by_tier(MILESTONES).items():
+    if tier == len(TIER_NAMES_FLAT) - 1:
+        continue
+    name = TIER_NAMES_FLAT[tier]
+    TOOLTIPS[name] = f"{TOOLTIPS.get(name, '')} [Unlocks {', '.join(titles)}]".strip()
+ACHIEVEMENT_TOAST_TIME = 4.0   # seconds a newly earned milestone stays on screen
 
+class FloatingText:
+    """One pooled "+$..." popup. Records are reused, never reallocated."""
+    __slots__ = ("active", "x", "y", "value", "text", "color", "alpha", "creation_time", "surface")
 
-# Group into pages (e.g., 24 per page)
-def group_into_pages(flat_list, per_page=24):
-    return [flat_list[i:i + per_page] for i in range(0, len(flat_list), per_page)]
-
-TIER_RPS = group_into_pages(TIER_RPS_FLAT)
-TIER_COSTS = group_into_pages([rps * 50 for rps in TIER_RPS_FLAT])
-TIER_NAMES = group_into_pages(TIER_NAMES_FLAT)
-
-# Format large numbers
-
-def format_number(n):
-    if n >= 1e66:
-        return f"{n:.3e}"
-    elif n >= 1e63:
-        return f"{n/1e63:.2f}Vi"
-    elif n >= 1e60:
-        return f"{n/1e60:.2f}Nod"
-    elif n >= 1e57:
-        return f"{n/1e57:.2f}Ocd"
-    elif n >= 1e54:
-        return f"{n/1e54:.2f}Spd"
-    elif n >= 1e51:
-        return f"{n/1e51:.2f}Sxd"
-    elif n >= 1e48:
-        return f"{n/1e48:.2f}Qid"
-    elif n >= 1e45:
-        return f"{n/1e45:.2f}Qad"
-    elif n >= 1e42:
-        return f"{n/1e42:.2f}Td"
-    elif n >= 1e39:
-        return f"{n/1e39:.2f}Dd"
-    elif n >= 1e36:
-        return f"{n/1e36:.2f}Ud"
-    elif n >= 1e33:
-        return f"{n/1e33:.2f}Dc"
-    elif n >= 1e30:
-        return f"{n/1e30:.2f}No"
-    elif n >= 1e27:
-        return f"{n/1e27:.2f}Oc"
-    elif n >= 1e24:
-        return f"{n/1e24:.2f}Sp"
-    elif n >= 1e21:
-        return f"{n/1e21:.2f}Sx"
-    elif n >= 1e18:
-        return f"{n/1e18:.2f}Qi"
-    elif n >= 1e15:
-        return f"{n/1e15:.2f}Qa"
-    elif n >= 1e12:
-        return f"{n/1e12:.2f}T"
-    elif n >= 1e9:
-        return f"{n/1e9:.2f}B"
-    elif n >= 1e6:
-        return f"{n/1e6:.2f}M"
-    elif n >= 1e2:
-        return f"{n:,.0f}"
-    else:
-        return f"{n:,.2f}"
+    def __init__(self):
+        self.active = False
+        self.surface = None
 
-class FloatingText:
-    def __init__(self, x, y, text, color=(0, 100, 0)):
-        self.x = x
-        self.y = y
-        self.text = text
-        self.color = color
-        self.alpha = 255
-        self.lifetime = 1.0  # seconds
-        self.creation_time = time.time()
 
-    def update(self):
-        elapsed = time.time() - self.creation_time
-        if elapsed > self.lifetime:
-            return False
-        self.y -= 0.5  # Move upward slowly
-        self.alpha = max(0, 255 - int((elapsed / self.lifetime) * 255))
-        return True
+class FloatingTextPool:
+    """
+    Fixed number of FloatingText records for click feedback.
+
+    Each popup renders its text once, when spawned or merged into. Clicks that
+    land within MERGE_INTERVAL of the newest popup add to its value instead of
+    spawning another, and when every record is live the oldest is recycled,
+    so an autoclicker costs the same memory and CPU as a few clicks a second.
+    """
+    LIFETIME = 1.0         # seconds
+    MERGE_INTERVAL = 0.05  # seconds
+    CAPACITY = 32
 
-    def draw(self, screen, font):
-        surface = font.render(self.text, True, self.color)
-        surface.set_alpha(self.alpha)
-        screen.blit(surface, (self.x, self.y))
+    def __init__(self, font, color=(0, 100, 0)):
+        self.font = font
+        self.color = color
+        self.records = [FloatingText() for _ in range(self.CAPACITY)]
+        self.newest = None
+
+    def spawn(self, x, y, value, now):
+        record = self.newest
+        if record is not None and record.active and now - record.creation_time < self.MERGE_INTERVAL:
+            record.value += value
+        else:
+            record = next((r for r in self.records if not r.active), None)
+            if record is None:
+                record = min(self.records, key=lambda r: r.creation_time)
+            record.active = True
+            record.x = x
+            record.y = y
+            record.value = value
+            record.color = self.color
+            record.alpha = 255
+            record.creation_time = now
+            self.newest = record
+        record.text = f"+${format_number(record.value)}"
+        record.surface = self.font.render(record.text, True, record.color)
+        record.surface.set_alpha(record.alpha)
+
+    def update(self, now):
+        for record in self.records:
+            if not record.active:
+                continue
+            elapsed = now - record.creation_time
+            if elapsed > self.LIFETIME:
+                record.active = False
+                record.surface = None
+                continue
+            record.y -= 0.5  # Move upward slowly
+            record.alpha = max(0, 255 - int((elapsed / self.LIFETIME) * 255))
+            record.surface.set_alpha(record.alpha)
+
+    def widgets(self):
+        for slot, record in enumerate(self.records):
+            if record.active:
+                rect = record.surface.get_rect(topleft=(record.x, record.y))
+                yield Widget(("floating_text", slot), rect, (record.text, record.alpha),
+                             lambda screen, surface=record.surface, rect=rect: screen.blit(surface, rect),
+                             "floating_texts")
 
 class UpgradeButton:
-    def __init__(self, x, y, width, height, index, rps_base, cost_base, name):
+    """On-screen view of one economy.Tier."""
+
+    def __init__(self, x, y, width, height, tier):
         self.rect = pygame.Rect(x, y, width, height)
-        self.index = index
-        self.rps_base = rps_base
-        self.cost_base = cost_base
-        self.level = 0
-        self.name = name  # unique name for this tier
+        self.tier = tier
+        self.index = tier.index
+        self.name = tier.name  # unique name for this tier
         self.parent_game = None  # set by IdleGame before use
 
+    @property
+    def level(self):
+        return self.tier.level
+
     def is_unlocked(self, game):
-        if self.index == 0:
-            return True
-        elif self.index % 24 == 0:
-            prev_tier_index = self.index - 1
-            if 0 <= prev_tier_index < len(game.all_buttons):
-                return game.all_buttons[prev_tier_index].level > 0
-            return False
-        else:
-            return game.all_buttons[self.index - 1].level > 0
+        return game.state.is_unlocked(self.index)
 
     def get_cost(self):
-        return self.cost_base * (1.15 ** self.level)
+        return self.tier.get_cost()
 
     def get_rps(self):
-        rps = self.rps_base * self.level
-        if self.level >= 200:
-            bonus = 1
-            capped_level = min(self.level, 8000)
-            bonus *= 4
-            bonus *= 4 ** ((capped_level - 200) // 25)
-            bonus *= 100 ** ((capped_level - 200) // 1000)
-            rps *= bonus
-        rps *= self.get_prestige_multiplier()
-        return rps
+        return self.tier.get_rps(self.get_prestige_multiplier())
 
     def get_prestige_multiplier(self):
-        return self.parent_game.prestige_multiplier if self.parent_game else 1.0
+        return self.parent_game.state.prestige_multiplier if self.parent_game else 1.0
 
-    def draw(self, screen, font, resources, game):
+    def get_labels(self, affordable, game):
+        """Fill color and text shown on the button; also its redraw signature."""
         unlocked = self.is_unlocked(game)
-        affordable = resources >= self.get_cost()
-        mouse_hover = self.rect.collidepoint(pygame.mouse.get_pos())
-
         color = GRAY if not unlocked else GREEN if affordable else RED
-        pygame.draw.rect(screen, color, self.rect)
-        pygame.draw.rect(screen, BLACK, self.rect, 2)
 
         # Render basic info
         name_text = f"{self.name}"
         level_text = f"Lv {self.level}"
-        rps_text = f"${format_number(self.get_rps()) if self.level > 0 else format_number(self.rps_base*self.get_prestige_multiplier())}/s"
+        rps_text = f"${format_number(self.get_rps()) if self.level > 0 else format_number(self.tier.rps_base*self.get_prestige_multiplier())}/s"
         cost_text = f"Cost: ${format_number(self.get_cost())}"
+        return color, name_text, level_text, rps_text, cost_text
 
-        screen.blit(font.render(name_text, True, BLACK), (self.rect.x + 5, self.rect.y + 3))
-        screen.blit(font.render(level_text, True, BLACK), (self.rect.x + 5, self.rect.y + 25))
-        screen.blit(font.render(rps_text, True, BLACK), (self.rect.x + 175, self.rect.y + 3))
-        screen.blit(font.render(cost_text, True, BLACK), (self.rect.x + 120, self.rect.y + 25))
-
-        # Draw tooltip if hovered
-        if mouse_hover:
-            tooltip = TOOLTIPS.get(self.name, "")
-            if tooltip:
-                self.draw_tooltip(screen, tooltip, font)
+    def draw(self, screen, font, labels, text_cache, recommended=False):
+        color, name_text, level_text, rps_text, cost_text = labels
+        pygame.draw.rect(screen, color, self.rect)
+        if recommended:
+            draw_border(screen, GOLD, self.rect, 4)
+        else:
+            draw_border(screen, BLACK, self.rect, 2)
 
+        screen.blit(text_cache.render(font, name_text, True, BLACK), (self.rect.x + 5, self.rect.y + 3))
+        screen.blit(text_cache.render(font, level_text, True, BLACK), (self.rect.x + 5, self.rect.y + 25))
+        screen.blit(text_cache.render(font, rps_text, True, BLACK), (self.rect.x + 175, self.rect.y + 3))
+        screen.blit(text_cache.render(font, cost_text, True, BLACK), (self.rect.x + 120, self.rect.y + 25))
 
     def handle_event(self, event, game, _):
         if event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
             if self.is_unlocked(game):
-                cost = self.get_cost()
-                if game.resource >= cost:
-                    multiplier = game.get_purchase_multiplier()
-                    for _ in range(multiplier):
-                        cost = self.get_cost()
-                        if game.resource >= cost:
-                            game.resource -= cost
-                            prev_rps = self.get_rps()
-                            self.level += 1
-                            new_rps = self.get_rps()
-                            game.total_rps += (new_rps - prev_rps)
-                        else:
-                            break
-
-    def draw_tooltip(self, screen, text, font):
-        words = text.split()
-        lines = []
-        line = ""
-        for word in words:
-            if font.size(line + word)[0] < 300:
-                line += word + " "
-            else:
-                lines.append(line)
-                line = word + " "
-        lines.append(line)
-
-        width = 320
-        height = 20 + 20 * len(lines)
-        x, y = pygame.mouse.get_pos()
-        x = min(x + 10, SCREEN_WIDTH - width - 10)
-        y = min(y + 10, SCREEN_HEIGHT - height - 10)
-
-        tooltip_rect = pygame.Rect(x, y, width, height)
-        pygame.draw.rect(screen, (255, 255, 200), tooltip_rect)
-        pygame.draw.rect(screen, BLACK, tooltip_rect, 2)
+                multiplier = game.get_purchase_multiplier()
+                limit = None if multiplier == BUY_MAX else multiplier
+                game.simulation.queue(game.buy, self.index, limit)
+
+
+def wrap_tooltip(text, font, max_width=300):
+    words = text.split()
+    lines = []
+    line = ""
+    for word in words:
+        if font.size(line + word)[0] < max_width:
+            line += word + " "
+        else:
+            lines.append(line.strip())
+            line = word + " "
+    lines.append(line.strip())
+    return lines
+
+
+def get_tooltip_rect(width, line_count):
+    # Next to the mouse, kept inside the window
+    height = 20 + 20 * line_count
+    x, y = pygame.mouse.get_pos()
+    x = min(x + 10, SCREEN_WIDTH - width - 10)
+    y = min(y + 10, SCREEN_HEIGHT - height - 10)
+    return pygame.Rect(x, y, width, height)
+
+
+def layout_tooltip(font, text, width, wrap, color=BLACK):
+    """
+    Word-wrap `text` (or split it at newlines if not `wrap`) and draw the whole
+    tooltip box onto its own surface. Returns (lines, surface); see TooltipCache.
+    """
+    if wrap:
+        lines = wrap_tooltip(text, font, width - 20)
+    else:
+        lines = [line.strip() for line in text.split("\n")]
 
-        for i, line in enumerate(lines):
-            rendered = font.render(line.strip(), True, BLACK)
-            screen.blit(rendered, (x + 5, y + 5 + i * 20))
+    surface = pygame.Surface((width, 20 + 20 * len(lines))).convert()
+    surface.fill((255, 255, 200))
+    draw_border(surface, BLACK, surface.get_rect(), 2)
+    for i, line in enumerate(lines):
+        surface.blit(font.render(line, True, color), (5, 5 + i * 20))
+    return lines, surface
 
 
 
 class IdleGame:
-    SAVE_FILE = "save.json"
+    SAVE_FILE = "save.dat"
+    LEGACY_SAVE_FILE = "save.json"   # pre-compression saves, still loaded if no SAVE_FILE exists
+    AUTOSAVE_INTERVAL = 30.0         # seconds between background autosaves
+    JOURNAL_FILE = "save.journal"    # actions since the last save, replayed on load (see journal.py)
+    JOURNAL_ARCHIVE = None           # set to a filename to keep every action ever journaled there
+    # GameState.fast_forward policy for auto-buying with offline income, e.g.
+    # economy.ChunkedBuyer(MILESTONE_STEP); None only collects income
+    OFFLINE_POLICY = None
+
+    def __init__(self, fps=FPS, tick_rate=TICK_RATE, prefer_jpg=False, deferred=False, startup_profile=None):
+        """
+        With `deferred`, everything that reads files (save, journal, background)
+        is left to run() to do one step per frame behind a loading screen, so
+        the window shows something right away. `startup_profile` (a
+        profiler.StartupProfile) gets a mark at the end of every startup phase.
+        """
+        self.fps = fps
+        self.tick_rate = tick_rate
+        self.startup_profile = startup_profile
 
-    def __init__(self):
         # --- Purchase and pagination setup ---
-        self.purchase_multipliers = [1, 10, 25, 100, 1000]
+        self.purchase_multipliers = [1, 10, 25, 100, 1000, BUY_MAX]
         self.current_multiplier_index = 0
         self.multiplier_button = pygame.Rect(SCREEN_WIDTH - 200, SCREEN_HEIGHT - 190, 160, 35)
 
+        # --- Core game variables (the headless economy) ---
+        self.state = GameState()
+        # Ranks tier purchases by payback time; its pick gets highlighted
+        self.optimizer = PaybackOptimizer(self.state)
+        # Fires arc changes and achievements as thresholds are crossed, instead of checking every frame
+        self.milestones = MilestoneEngine(self.state, MILESTONES)
+        self.milestones.on_reached.append(self.milestone_reached)
+        self.milestones.on_lost.append(self.milestone_lost)
+        self.achievement_toasts = deque(maxlen=3)   # (milestone, time earned), newest last
+        self.mark_startup("economy")
+
         pygame.display.set_caption("Investment Simulator")
         self.current_page = 0
-        self.total_pages = len(TIER_RPS)
+        self.total_pages = (len(self.state.tiers) + TIERS_PER_PAGE - 1) // TIERS_PER_PAGE
         self.next_button = pygame.Rect(SCREEN_WIDTH - 150, 30, 120, 40)
         self.prev_button = pygame.Rect(SCREEN_WIDTH - 300, 30, 120, 40)
 
         # --- Pygame setup ---
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont(None, 22)
-        self.big_font = pygame.font.SysFont(None, 36)
-
-        # --- Core game variables ---
-        self.prestige_points = 0
-        self.prestige_multiplier = 1.0
-        self.super_multiplier = 1.0      # NEW: cumulative super multiplier
-        self.total_rps = 0.0
-        self.resource = 0.0
+        self.mark_startup("window")
+        # pygame's default font. SysFont(None, ...) returns the same one, but only
+        # after indexing every installed system font, which is slow on some machines.
+        self.font = pygame.font.Font(None, 22)
+        self.big_font = pygame.font.Font(None, 36)
+        self.mark_startup("fonts")
+        self.text_cache = TextCache()
+        self.tooltip_cache = TooltipCache(layout_tooltip)
+        self.profiler = FrameProfiler()
+        self.renderer = DirtyRenderer(self.screen, self.profiler)
+        self.last_input_time = time.time()
+        self.show_profiler = False
+        self.profiler_lines = []
+        self.profiler_refresh_time = 0
+        self.stats = StatsRecorder()
+        self.last_stats_time = 0
+        self.stats_view = None   # RESOLUTIONS name shown in the graph panel, or None
+        self.stats_graph_key = None
+        self.stats_graph = None
+
+        # --- Frame state ---
         self.last_update = time.time()
-        self.total_ascensions_this_transcendence = 0
-        self.total_transcendences = 0
-        self.floating_texts = []
+        self.floating_texts = FloatingTextPool(self.font)
         self.resource_info_rect = pygame.Rect(50, 30, 150, 20)
 
         # --- All upgrade buttons and the subset for the current page ---
@@ -380,55 +390,81 @@ class IdleGame:
         self.prestige_button = pygame.Rect(SCREEN_WIDTH - 200, SCREEN_HEIGHT - 140, 160, 40)
         self.super_prestige_button = pygame.Rect(SCREEN_WIDTH - 380, SCREEN_HEIGHT - 190, 160, 40)
 
-        # --- Backgrounds ---
-
-        self.backgrounds = {
-            "default": pygame.image.load("piggy_bank.png").convert(),
-            "mansion": pygame.image.load("mansion.png").convert(),
-            "earth": pygame.image.load("earth.png").convert(),
-            "nebula": pygame.image.load("nebula.png").convert(),
-            "galaxy": pygame.image.load("galaxy.png").convert(),
-            "supercluster": pygame.image.load("supercluster.png").convert(),
-            "black": pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        }
-        self.backgrounds["black"].fill((0, 0, 0))  # solid black
-
-        self.current_background = self.backgrounds["default"]
+        # --- Backgrounds (decoded when first needed, see assets.py) ---
+        self.backgrounds = AssetManager(BACKGROUND_FILES, self.screen.get_size(), prefer_jpg=prefer_jpg)
         self.text_color = BLACK
 
         # --- Arc Titles ---
-        
-        self.arc_titles = [
-            (0, "Personal Items"),
-            (10, "Luxuries"),
-            (16, "Power"),
-            (23, "Solar Neighborhood"),
-            (33, "Galactic Structures"),
-            (43, "Beyond Comprehension"),
-            (47, "The Singularity")
-        ]
-        self.current_arc_title = "Arc I: Personal Items"
+        self.current_arc_index = 0
+        self.current_arc_title = ARCS[0][2]
         self.arc_flash_time = 0
+        self.mark_startup("ui")
+
+        # --- Startup steps that touch the disk ---
+        self.startup_steps = deque([
+            ("load save", self.startup_load_save),
+            ("background", self.startup_background),
+        ])
+        if deferred:
+            self.draw_loading_screen()
+            self.mark_startup("loading screen")
+        else:
+            self.finish_startup()
+
+    # —————— STARTUP ——————
+
+    def mark_startup(self, name):
+        if self.startup_profile is not None:
+            self.startup_profile.mark(name)
+
+    def startup_load_save(self):
+        # Saved state (if any), plus the actions journaled after it, plus offline gain
+        self.journal = ActionJournal(self.JOURNAL_FILE, self.JOURNAL_ARCHIVE)
+        loaded = self.load_game()
+        self.autosaver = Autosaver(self.SAVE_FILE, on_saved=self.compact_journal)
+        self.last_autosave = time.time()
+
+        # Economy ticks run at their own fixed rate; update() feeds them wall-clock time
+        self.simulation = FixedStepSimulation(self.state, self.tick_rate, time.time())
+        self.last_update = time.time()
+        if loaded:
+            # Snapshot right away, so the journal never has to replay across the offline time just paid out
+            self.autosaver.submit(self.get_save_data())
+
+    def startup_background(self):
+        # Only the loaded arc's background is decoded up front
+        self.current_arc_index = None
+        self.update_background()
+
+    def run_startup_step(self):
+        name, step = self.startup_steps.popleft()
+        step()
+        self.mark_startup(name)
+
+    def finish_startup(self):
+        while self.startup_steps:
+            self.run_startup_step()
 
-        # Load saved state (if any), including offline gain:
-        self.load_game()
+    def draw_loading_screen(self):
+        self.screen.fill(BLACK)
+        text = self.text_cache.render(self.big_font, "Loading...", True, WHITE)
+        self.screen.blit(text, text.get_rect(center=self.screen.get_rect().center))
+        pygame.display.flip()
 
     def create_all_buttons(self):
         buttons = []
-        for page_idx, (rps_page, cost_page, name_page) in enumerate(zip(TIER_RPS, TIER_COSTS, TIER_NAMES)):
-            for i in range(len(rps_page)):
-                x = 50 + (i % 3) * 300
-                y = 120 + (i // 3) * 60
-                global_index = i + page_idx * 24
-                name = name_page[i] if i < len(name_page) else f"Tier {global_index + 1}"
-                btn = UpgradeButton(x, y, 280, 50, global_index, rps_page[i], cost_page[i], name)
-                btn.parent_game = self
-                buttons.append(btn)
+        for tier in self.state.tiers:
+            i = tier.index % TIERS_PER_PAGE
+            x = 50 + (i % 3) * 300
+            y = 120 + (i // 3) * 60
+            btn = UpgradeButton(x, y, 280, 50, tier)
+            btn.parent_game = self
+            buttons.append(btn)
         return buttons
 
     def get_current_page_buttons(self):
-        start = self.current_page * 24
-        end = start + 24
+        start = self.current_page * TIERS_PER_PAGE
+        end = start + TIERS_PER_PAGE
         for btn in self.all_buttons[start:end]:
             btn.parent_game = self
         return self.all_buttons[start:end]
@@ -441,267 +477,364 @@ class IdleGame:
         if 0 <= new_page < self.total_pages:
             self.current_page = new_page
             self.buttons = self.get_current_page_buttons()
+            self.journal.record(self.simulation.time, PAGE, value=new_page)
 
-    def get_total_rps(self):
-        return self.total_rps
-
-    def calculate_prestige_gain(self):
-        total_levels = sum(button.level for button in self.all_buttons)
-        return int(total_levels * 1)
-
-    def can_prestige(self):
-        # Unlock prestige at Tier 33 (index 32)
-        return self.all_buttons[32].level > 0
-
-    def apply_prestige(self):
-        if not self.can_prestige():
-            return
-        base_gain = self.calculate_prestige_gain()
-        if base_gain == 0:
-            return
-        # Apply super multiplier to prestige gain
-        gained = int(base_gain * self.super_multiplier)
-        self.prestige_points += gained
-        self.prestige_multiplier = 1.0 + self.prestige_points * 0.01
-
-        # Reset all tiers and resources
-        for button in self.all_buttons:
-            button.level = 0
-        self.total_rps = 0.0
-        self.resource = 0.0
-
-        self.total_ascensions_this_transcendence += 1
-
-    def can_super_prestige(self):
-        # Can only super prestige if the player has at least 1 prestige point
-        return self.prestige_points >= 1
-
-    def apply_super_prestige(self):
-        if not self.can_super_prestige():
-            return
-        # Each prestige point gives 0.001 to super multiplier
-        self.super_multiplier += self.prestige_points * 0.001
+    def cycle_multiplier(self):
+        self.current_multiplier_index = (self.current_multiplier_index + 1) % len(self.purchase_multipliers)
+        self.journal.record(self.simulation.time, MULTIPLIER, value=self.current_multiplier_index)
 
-        # Reset prestige points and multiplier
-        self.prestige_points = 0
-        self.prestige_multiplier = 1.0
+    def get_total_rps(self):
+        return self.state.total_rps
 
-        # Also fully reset the game state (all tiers, resources, RPS)
-        for button in self.all_buttons:
-            button.level = 0
-        self.total_rps = 0.0
-        self.resource = 0.0
+    def get_scaled_background(self, name):
+        """Background `name` scaled to the current window size and converted for fast blits."""
+        self.backgrounds.resize(self.screen.get_size())
+        return self.backgrounds.get(name)
 
-        self.total_transcendences += 1
-        self.total_ascensions_this_transcendence = 0  # reset ascensions for the new cycle
+    def prefetch_backgrounds(self, arc_index):
+        # The next arc, and Arc I, where every Ascension and Transcendence goes back to
+        if arc_index + 1 < len(ARCS):
+            self.backgrounds.prefetch(ARCS[arc_index + 1][0])
+        self.backgrounds.prefetch(ARCS[0][0])
 
-    
     def update_background(self):
-        previous_title = self.current_arc_title
-
-        if self.all_buttons[47].level > 0:
-            self.current_background = self.backgrounds["black"]
-            self.text_color = WHITE
-            self.current_arc_title = "Arc VII: The Singularity"
-        elif self.all_buttons[43].level > 0:
-            self.current_background = self.backgrounds["supercluster"]
-            self.text_color = WHITE
-            self.current_arc_title = "Arc VI: Beyond Comprehension"
-        elif self.all_buttons[33].level > 0:
-            self.current_background = self.backgrounds["galaxy"]
-            self.text_color = WHITE
-            self.current_arc_title = "Arc V: Galactic Structures"
-        elif self.all_buttons[23].level > 0:
-            self.current_background = self.backgrounds["nebula"]
-            self.text_color = WHITE
-            self.current_arc_title = "Arc IV: Solar Neighborhood"
-        elif self.all_buttons[16].level > 0:
-            self.current_background = self.backgrounds["earth"]
-            self.text_color = WHITE
-            self.current_arc_title = "Arc III: Power"
-        elif self.all_buttons[10].level > 0:
-            self.current_background = self.backgrounds["mansion"]
-            self.text_color = BLACK
-            self.current_arc_title = "Arc II: Luxuries"
-        else:
-            self.current_background = self.backgrounds["default"]
-            self.text_color = BLACK
-            self.current_arc_title = "Arc I: Personal Items"
+        # Called when an arc unlock is reached or lost; only does work when the arc really changed
+        arc_index = self.state.arc_index
+        if arc_index == self.current_arc_index:
+            return
+        self.current_arc_index = arc_index
+        background, self.text_color, self.current_arc_title = ARCS[arc_index]
+        self.current_background = self.get_scaled_background(background)
+        self.prefetch_backgrounds(arc_index)
+        self.renderer.invalidate()
 
         # Trigger arc title flash on change
-        if self.current_arc_title != previous_title:
-            self.arc_flash_time = time.time()
+        self.arc_flash_time = time.time()
 
     def update(self):
         current_time = time.time()
-        elapsed = current_time - self.last_update
-        self.resource += self.total_rps * elapsed
+        self.simulation.advance(current_time)
+        self.journal.flush()
         self.last_update = current_time
-        # Remove expired texts
-        self.floating_texts = [ft for ft in self.floating_texts if ft.update()]
-        self.update_background()
-
-    def draw_multiline_tooltip(self, screen, text, font, color):
-        lines = text.split("\n")
-        width = 220
-        height = 20 + 20 * len(lines)
-        x, y = pygame.mouse.get_pos()
-        x = min(x + 10, SCREEN_WIDTH - width - 10)
-        y = min(y + 10, SCREEN_HEIGHT - height - 10)
-
-        tooltip_rect = pygame.Rect(x, y, width, height)
-        pygame.draw.rect(screen, (255, 255, 200), tooltip_rect)
-        pygame.draw.rect(screen, BLACK, tooltip_rect, 2)
-
-        for i, line in enumerate(lines):
-            rendered = font.render(line.strip(), True, color)
-            screen.blit(rendered, (x + 5, y + 5 + i * 20))
-
-    def draw(self):
-        self.screen.blit(pygame.transform.scale(self.current_background, (SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0))
-        self.hovered_button = None
+        if current_time - self.last_stats_time >= STATS_INTERVAL:
+            self.stats.record(current_time, self.state)
+            self.last_stats_time = current_time
+        if current_time - self.last_autosave >= self.AUTOSAVE_INTERVAL:
+            self.autosaver.submit(self.get_save_data())
+            self.last_autosave = current_time
+        # Move, fade and expire click popups
+        self.floating_texts.update(current_time)
+        self.milestones.check_resource()
+
+    # —————— RENDERING ——————
+
+    def text_widget(self, key, font, text, color, **position):
+        surface = self.text_cache.render(font, text, True, color)
+        rect = surface.get_rect(**position)
+        return Widget(key, rect, (text, color), lambda screen: screen.blit(surface, rect))
+
+    def draw_labeled_rect(self, screen, rect, fill, labels):
+        pygame.draw.rect(screen, fill, rect)
+        draw_border(screen, BLACK, rect, 2)
+        for text, (dx, dy) in labels:
+            screen.blit(self.text_cache.render(self.font, text, True, BLACK), (rect.x + dx, rect.y + dy))
+
+    def labeled_rect_widget(self, key, rect, fill, labels):
+        return Widget(key, rect, labels, partial(self.draw_labeled_rect, rect=rect, fill=fill, labels=labels))
+
+    def draw_click_panel(self, screen, click_info_text):
+        pygame.draw.rect(screen, (200, 230, 255), self.click_rect)
+        draw_border(screen, BLACK, self.click_rect, 2)
+
+        click_text = self.text_cache.render(self.big_font, "CLICK HERE TO EARN", True, BLACK)
+        click_info = self.text_cache.render(self.font, click_info_text, True, BLACK)
+        text_rect = click_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 55))
+        info_rect = click_info.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 25))
+        screen.blit(click_text, text_rect)
+        screen.blit(click_info, info_rect)
+
+    def tooltip_widget(self, key, text, width, wrap=True):
+        lines, surface = self.tooltip_cache.get(self.font, text, width, wrap)
+        rect = get_tooltip_rect(width, len(lines))
+        return Widget(key, rect, text, lambda screen: screen.blit(surface, rect), "tooltips")
+
+    def build_widgets(self):
+        """The whole frame as a back-to-front widget list for the DirtyRenderer."""
+        state = self.state
+        color = self.text_color
         mouse_pos = pygame.mouse.get_pos()
 
-        # Resource display
-        res_text = self.big_font.render(f"${format_number(self.resource)}", True, self.text_color)
-        rps_text = self.font.render(f"${format_number(self.get_total_rps())}/s", True, self.text_color)
-        self.screen.blit(res_text, (50, 30))
-        self.screen.blit(rps_text, (50, 70))
-
-        # Prestige displays
-        points_text = self.font.render(f"Ascension Points: {format_number(self.prestige_points)} Points", True, self.text_color)
-        prestige_mult_text = self.font.render(f"Ascension Power: {format_number(self.prestige_multiplier)}x", True, self.text_color)
-        super_mult_text = self.font.render(f"Transcendent Power: {format_number(self.super_multiplier)}TP", True, self.text_color)
-        self.screen.blit(points_text, (50, 85))
-        self.screen.blit(prestige_mult_text, (50, 100))
-        self.screen.blit(super_mult_text, (300, 70))
-        ascension_stat_text = self.font.render(
-            f"Ascensions this Transcendence: {self.total_ascensions_this_transcendence}", True, self.text_color
-        )
-        self.screen.blit(ascension_stat_text, (300, 85))
-
-        transcendence_stat_text = self.font.render(
-            f"Total Transcendences: {self.total_transcendences}", True, self.text_color
-        )
-        self.screen.blit(transcendence_stat_text, (300, 100))
-
-        # Page navigation UI
-        pygame.draw.rect(self.screen, GRAY, self.next_button)
-        pygame.draw.rect(self.screen, GRAY, self.prev_button)
-        pygame.draw.rect(self.screen, BLACK, self.next_button, 2)
-        pygame.draw.rect(self.screen, BLACK, self.prev_button, 2)
-
-        next_text = self.font.render("Next Page", True, BLACK)
-        prev_text = self.font.render("Prev Page", True, BLACK)
-        page_text = self.font.render(f"Page {self.current_page + 1}/{self.total_pages}", True, self.text_color)
-
-        self.screen.blit(next_text, (self.next_button.x + 10, self.next_button.y + 10))
-        self.screen.blit(prev_text, (self.prev_button.x + 10, self.prev_button.y + 10))
-        self.screen.blit(page_text, (SCREEN_WIDTH // 2 - 40, 30))
+        widgets = [
+            # Resource display
+            self.text_widget("resource", self.big_font, f"${format_number(state.resource)}", color, topleft=(50, 30)),
+            self.text_widget("rps", self.font, f"${format_number(self.get_total_rps())}/s", color, topleft=(50, 70)),
+
+            # Prestige displays
+            self.text_widget("points", self.font, f"Ascension Points: {format_number(state.prestige_points)} Points", color, topleft=(50, 85)),
+            self.text_widget("prestige_mult", self.font, f"Ascension Power: {format_number(state.prestige_multiplier)}x", color, topleft=(50, 100)),
+            self.text_widget("super_mult", self.font, f"Transcendent Power: {format_number(state.super_multiplier)}TP", color, topleft=(300, 70)),
+            self.text_widget("ascension_stat", self.font, f"Ascensions this Transcendence: {state.total_ascensions_this_transcendence}", color, topleft=(300, 85)),
+            self.text_widget("transcendence_stat", self.font, f"Total Transcendences: {state.total_transcendences}", color, topleft=(300, 100)),
+            self.text_widget("achievement_stat", self.font, f"Achievements: {len(self.milestones.earned)}/{len(MILESTONES)}", color, topleft=(550, 100)),
+
+            # Page navigation UI
+            self.labeled_rect_widget("next_button", self.next_button, GRAY, (("Next Page", (10, 10)),)),
+            self.labeled_rect_widget("prev_button", self.prev_button, GRAY, (("Prev Page", (10, 10)),)),
+            self.text_widget("page", self.font, f"Page {self.current_page + 1}/{self.total_pages}", color, topleft=(SCREEN_WIDTH // 2 - 40, 30)),
+        ]
 
-        # Draw upgrade buttons
+        # Upgrade buttons
+        self.hovered_button = None
+        recommendation = self.optimizer.recommend()
+        recommended_index = recommendation[0] if recommendation else None
+        # One vectorized price check for every tier instead of a BigNum compare per button
+        affordable = state.catalog.affordable(state.resource)
         for button in self.buttons:
-            button.draw(self.screen, self.font, self.resource, self)
-            if button.rect.collidepoint(pygame.mouse.get_pos()):
+            labels = button.get_labels(bool(affordable[button.index]), self)
+            recommended = button.index == recommended_index
+            widgets.append(Widget(("button", button.index), button.rect, (labels, recommended),
+                                  partial(button.draw, font=self.font, labels=labels, text_cache=self.text_cache,
+                                          recommended=recommended), "buttons"))
+            if button.rect.collidepoint(mouse_pos):
                 self.hovered_button = button
-            # Check if hovering over Ascend or Transcend buttons
-            if self.prestige_button.collidepoint(mouse_pos):
-                self.hovered_button = "Ascend"
-            elif self.super_prestige_button.collidepoint(mouse_pos):
-                self.hovered_button = "Transcend"
-                
-
-        # Draw click panel
-        pygame.draw.rect(self.screen, (200, 230, 255), self.click_rect)
-        pygame.draw.rect(self.screen, BLACK, self.click_rect, 2)
-
-        click_value = 0.01
-        if self.all_buttons[0].level > 0:
-            click_value += self.get_total_rps() * 0.1
-
-        click_text = self.big_font.render("CLICK HERE TO EARN", True, BLACK)
-        click_info = self.font.render(
-            f"Click Value: ${format_number(click_value)} ($0.01 + 10% RPS)", True, BLACK
-        )
-        text_rect = click_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 55))
-        info_rect = click_info.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 25))
-        self.screen.blit(click_text, text_rect)
-        self.screen.blit(click_info, info_rect)
-
-        # Prestige button
-        pygame.draw.rect(self.screen, RED, self.prestige_button)
-        pygame.draw.rect(self.screen, BLACK, self.prestige_button, 2)
-        prestige_text = self.font.render("Ascend", True, BLACK)
-        gain = self.calculate_prestige_gain() if self.can_prestige() else 0
-        hint_text = self.font.render(f"+{format_number(int(gain * self.super_multiplier))} Points", True, BLACK)
-        self.screen.blit(prestige_text, (self.prestige_button.x + 10, self.prestige_button.y + 5))
-        self.screen.blit(hint_text, (self.prestige_button.x + 10, self.prestige_button.y + 22))
-
-        # Super Prestige button
-        pygame.draw.rect(self.screen, (150, 50, 150), self.super_prestige_button)
-        pygame.draw.rect(self.screen, BLACK, self.super_prestige_button, 2)
-        super_text = self.font.render("Transcend", True, BLACK)
-        super_hint = self.font.render(f"+{format_number(self.prestige_points * 0.001)}TP", True, BLACK)
-        self.screen.blit(super_text, (self.super_prestige_button.x + 5, self.super_prestige_button.y + 5))
-        self.screen.blit(super_hint, (self.super_prestige_button.x + 5, self.super_prestige_button.y + 22))
-
-        # Multiplier button (x1, x10, x25, etc.)
-        pygame.draw.rect(self.screen, (200, 200, 255), self.multiplier_button)
-        pygame.draw.rect(self.screen, BLACK, self.multiplier_button, 2)
-        mult_text = self.font.render(f"Buy x{self.get_purchase_multiplier()}", True, BLACK)
-        self.screen.blit(mult_text, (self.multiplier_button.x + 25, self.multiplier_button.y + 8))
-
+        # Check if hovering over Ascend or Transcend buttons
+        if self.prestige_button.collidepoint(mouse_pos):
+            self.hovered_button = "Ascend"
+        elif self.super_prestige_button.collidepoint(mouse_pos):
+            self.hovered_button = "Transcend"
+
+        # Click panel
+        click_info_text = f"Click Value: ${format_number(state.get_click_value())} ($0.01 + 10% RPS)"
+        widgets.append(Widget("click_panel", self.click_rect, click_info_text,
+                              partial(self.draw_click_panel, click_info_text=click_info_text)))
+
+        # Prestige, Super Prestige and multiplier (x1, x10, x25, etc.) buttons
+        gain = state.calculate_prestige_gain() if state.can_prestige() else 0
+        widgets.append(self.labeled_rect_widget("prestige_button", self.prestige_button, RED, (
+            ("Ascend", (10, 5)),
+            (f"+{format_number(int(gain * state.super_multiplier))} Points", (10, 22)),
+        )))
+        widgets.append(self.labeled_rect_widget("super_prestige_button", self.super_prestige_button, (150, 50, 150), (
+            ("Transcend", (5, 5)),
+            (f"+{format_number(state.prestige_points * 0.001)}TP", (5, 22)),
+        )))
+        multiplier = self.get_purchase_multiplier()
+        mult_label = "Buy Max" if multiplier == BUY_MAX else f"Buy x{multiplier}"
+        widgets.append(self.labeled_rect_widget("multiplier_button", self.multiplier_button, (200, 200, 255), (
+            (mult_label, (25, 8)),
+        )))
+
+        # Tooltip for the hovered upgrade, Ascend or Transcend button
         if isinstance(self.hovered_button, UpgradeButton):
             tooltip = TOOLTIPS.get(self.hovered_button.name, "")
-            if tooltip:
-                self.hovered_button.draw_tooltip(self.screen, tooltip, self.font)
         elif isinstance(self.hovered_button, str):
             tooltip = TOOLTIPS.get(self.hovered_button, "")
-            if tooltip:
-                # Use a temporary dummy UpgradeButton to draw the tooltip
-                dummy_button = UpgradeButton(0, 0, 0, 0, -1, 0, 0, self.hovered_button)
-                dummy_button.draw_tooltip(self.screen, tooltip, self.font)
+        else:
+            tooltip = ""
+        if tooltip:
+            widgets.append(self.tooltip_widget("tooltip", tooltip, 320))
 
-        for ft in self.floating_texts:
-            ft.draw(self.screen, self.font)
+        widgets.extend(self.floating_texts.widgets())
+        widgets.extend(self.achievement_widgets())
 
-        # Draw arc title if recently changed
-        if time.time() - self.arc_flash_time < 3:  # display for 3 seconds
+        # Arc title if recently changed
+        elapsed = time.time() - self.arc_flash_time
+        if elapsed < 3:  # display for 3 seconds
             alpha = 255
-            elapsed = time.time() - self.arc_flash_time
             if elapsed > 2.5:
                 alpha = int(255 * (1 - (elapsed - 2.5) / 0.5))  # fade out last 0.5s
+            title = self.current_arc_title
+            rect = self.text_cache.render(self.big_font, title, True, color).get_rect(center=(SCREEN_WIDTH // 2, 100))
+            surface = partial(self.text_cache.render_alpha, self.big_font, title, True, color, alpha)
+            widgets.append(Widget("arc_title", rect, (title, color, alpha),
+                                  lambda screen, surface=surface, rect=rect: screen.blit(surface(), rect)))
 
-            arc_surface = self.big_font.render(self.current_arc_title, True, self.text_color)
-            arc_surface.set_alpha(alpha)
-            arc_rect = arc_surface.get_rect(center=(SCREEN_WIDTH // 2, 100))
-            self.screen.blit(arc_surface, arc_rect)
+        if self.resource_info_rect.collidepoint(mouse_pos):
+            widgets.append(self.tooltip_widget("number_format_tooltip", NUMBER_FORMAT_TOOLTIP, 220, wrap=False))
 
-        if self.resource_info_rect.collidepoint(pygame.mouse.get_pos()):
-            self.draw_multiline_tooltip(self.screen, NUMBER_FORMAT_TOOLTIP, self.font, BLACK)
+        if self.stats_view is not None:
+            widgets.append(self.stats_widget())
 
+        if self.show_profiler:
+            widgets.append(self.profiler_widget())
 
-        pygame.display.flip()
+        return widgets
+
+    def achievement_widgets(self):
+        # Newest at the bottom, above the click panel; each fades out over its last second
+        widgets = []
+        now = time.time()
+        while self.achievement_toasts and now - self.achievement_toasts[0][1] >= ACHIEVEMENT_TOAST_TIME:
+            self.achievement_toasts.popleft()
+        for i, (milestone, earned_time) in enumerate(reversed(self.achievement_toasts)):
+            remaining = ACHIEVEMENT_TOAST_TIME - (now - earned_time)
+            alpha = int(255 * min(1.0, remaining))
+            text = f"{'Unlocked' if milestone.unlock else 'Achievement'}: {milestone.title}"
+            rect = self.text_cache.render(self.font, text, True, GOLD).get_rect(bottomleft=(50, SCREEN_HEIGHT - 100 - i * 18))
+            surface = partial(self.text_cache.render_alpha, self.font, text, True, GOLD, alpha)
+            widgets.append(Widget(("achievement", milestone.key), rect, (text, alpha),
+                                  lambda screen, surface=surface, rect=rect: screen.blit(surface(), rect)))
+        return widgets
+
+    def get_profiler_lines(self):
+        # Refreshed a couple of times a second so the numbers stay readable
+        now = time.time()
+        if now - self.profiler_refresh_time >= PROFILER_REFRESH:
+            self.profiler_refresh_time = now
+            profiler = self.profiler
+            self.profiler_lines = [
+                f"FPS {self.clock.get_fps():.1f}  (budget {1000 / self.fps:.1f} ms)",
+                f"ticks/s {self.simulation.tick_rate}",
+                f"frame ms  p50 {profiler.percentile(50) * 1000:.2f}  p95 {profiler.percentile(95) * 1000:.2f}"
+                f"  p99 {profiler.percentile(99) * 1000:.2f}",
+            ] + [f"{name:<22}{seconds * 1000:7.3f} ms" for name, seconds in profiler.phase_averages().items()]
+        return self.profiler_lines
+
+    def draw_profiler(self, screen, lines, rect):
+        screen.fill((20, 20, 20), rect)
+        for i, line in enumerate(lines):
+            screen.blit(self.text_cache.render(self.font, line, True, GREEN), (rect.x + 6, rect.y + 4 + i * 16))
+
+    def profiler_widget(self):
+        lines = tuple(self.get_profiler_lines())
+        rect = pygame.Rect(SCREEN_WIDTH - 330, 80, 320, 8 + 16 * len(lines))
+        return Widget("profiler", rect, lines, partial(self.draw_profiler, lines=lines, rect=rect), "overlay")
+
+    def toggle_profiler(self):
+        self.show_profiler = not self.show_profiler
+        # Keep collecting while a programmatic listener is attached
+        self.profiler.enabled = self.show_profiler or bool(self.profiler.listeners)
+        self.profiler.frames.clear()
+        self.profiler_refresh_time = 0
+
+    def draw_graph_line(self, surface, plot, values, slots, low, high, color):
+        # Newest value at the right edge; NaN gaps break the line
+        step = plot.width / max(1, slots - 1)
+        scale = plot.height / (high - low)
+        offset = slots - len(values)
+        points = []
+        for i, value in enumerate(values + [math.nan]):
+            if value == value:
+                points.append((plot.x + (offset + i) * step, plot.bottom - (value - low) * scale))
+                continue
+            if len(points) > 1:
+                pygame.draw.lines(surface, color, False, points)
+            elif points:
+                surface.fill(color, (*points[0], 2, 2))
+            points = []
+
+    def render_stats_graph(self, resolution):
+        """The history panel for one resolution as a finished surface."""
+        series = self.stats.series[resolution]
+        surface = pygame.Surface(STATS_RECT.size)
+        surface.fill((20, 20, 20))
+        draw_border(surface, GRAY, surface.get_rect(), 1)
+        title = f"{STATS_TITLES[resolution]}:  $ (green)  $/s (gold)  [F4]"
+        surface.blit(self.text_cache.render(self.font, title, True, WHITE), (8, 6))
+
+        resource = series.values("resource_log10").tolist()
+        rps = series.values("rps_log10").tolist()
+        bounds = value_range(resource, rps)
+        if bounds is None:
+            surface.blit(self.text_cache.render(self.font, "No history yet", True, GRAY), (8, 30))
+            return surface
+        # log10 axis, at least one power of ten tall
+        low, high = bounds
+        if high - low < 1:
+            low, high = (low + high) / 2 - 0.5, (low + high) / 2 + 0.5
+        plot = pygame.Rect(90, 30, STATS_RECT.width - 100, STATS_RECT.height - 42)
+        draw_border(surface, (70, 70, 70), plot, 1)
+        for value, y in ((high, plot.top), (low, plot.bottom - 14)):
+            label = f"${format_number(BigNum.from_log10(value))}"
+            surface.blit(self.text_cache.render(self.font, label, True, GRAY), (8, y))
+        slots = series.rings[0].size + 1   # the finished samples plus the bucket in progress
+        self.draw_graph_line(surface, plot, resource, slots, low, high, GREEN)
+        self.draw_graph_line(surface, plot, rps, slots, low, high, GOLD)
+        return surface
+
+    def stats_widget(self):
+        # Rebuilt only when a new sample came in or the resolution changed
+        key = (self.stats_view, self.stats.samples)
+        if key != self.stats_graph_key:
+            self.stats_graph_key = key
+            self.stats_graph = self.render_stats_graph(self.stats_view)
+        surface = self.stats_graph
+        return Widget("stats_graph", STATS_RECT, key, lambda screen: screen.blit(surface, STATS_RECT), "overlay")
+
+    def cycle_stats_view(self):
+        names = [name for name, _, _ in RESOLUTIONS] + [None]
+        self.stats_view = names[(names.index(self.stats_view) + 1) % len(names)]
+        self.stats_graph_key = None
+
+    def draw(self):
+        with self.profiler.phase("draw.build"):
+            widgets = self.build_widgets()
+        dirty = self.renderer.render(self.current_background, widgets)
+        if dirty:
+            with self.profiler.phase("display"):
+                pygame.display.update(dirty)
 
     def handle_click(self):
-        click_value = 0.01
-        if self.all_buttons[0].level > 0:
-            click_value += self.get_total_rps() * 0.1
+        self.simulation.queue(self.apply_click)
+
+    # —————— ACTIONS (applied between economy ticks, and journaled) ——————
 
-        self.resource += click_value
+    def buy(self, index, limit):
+        bought = self.state.buy(index, limit)
+        if bought:
+            # The count actually bought, so replay doesn't depend on what the limit meant
+            self.journal.record(self.simulation.time, BUY, index, bought)
+            self.milestones.bought(index)
+        return bought
+
+    def apply_prestige(self):
+        if self.state.can_prestige():
+            self.state.apply_prestige()
+            self.journal.record(self.simulation.time, ASCEND)
+            self.milestones.refresh()
+
+    def apply_super_prestige(self):
+        if self.state.can_super_prestige():
+            self.state.apply_super_prestige()
+            self.journal.record(self.simulation.time, TRANSCEND)
+            self.milestones.refresh()
+
+    def milestone_reached(self, milestone, first_time):
+        if milestone.stat == "highest_tier":
+            self.update_background()
+        if first_time:
+            self.achievement_toasts.append((milestone, time.time()))
+
+    def milestone_lost(self, milestone):
+        # An Ascension or Transcendence went back to Arc I
+        self.update_background()
+
+    def apply_click(self):
+        click_value = self.state.click()
+        self.journal.record(self.simulation.time, CLICK)
 
         # Create visual feedback text
-        self.floating_texts.append(FloatingText(
-            SCREEN_WIDTH // 2 - 20,
-            SCREEN_HEIGHT - 90,
-            f"+${format_number(click_value)}"
-        ))
+        self.floating_texts.spawn(SCREEN_WIDTH // 2 - 20, SCREEN_HEIGHT - 90, click_value, self.last_update)
+
+    # —————— SAVE/LOAD WITH OFFLINE GAIN ——————
+
+    def get_save_data(self):
+        # Economy time, not wall time: it's what the journal's timestamps continue from
+        data = self.state.to_dict(self.simulation.time)
+        data["current_multiplier_index"] = self.current_multiplier_index
+        data["current_page"] = self.current_page
+        data["journal_seq"] = self.journal.seq
+        data["stats"] = self.stats.snapshot()
+        data["achievements"] = self.milestones.to_list()
+        return data
 
-    # —————— JSON SAVE/LOAD WITH OFFLINE GAIN ——————
+    def compact_journal(self, data):
+        # `data` is now on disk as SAVE_FILE, so the journal only needs what came after it
+        self.journal.compact(data["journal_seq"])
 
     def save_game(self, filename=None):
         """
-        Save:
+        Atomically write a compressed save (see savefile.py) with:
           - resource
           - total_rps
           - prestige_points, prestige_multiplier
@@ -713,143 +846,188 @@ class IdleGame:
         if filename is None:
             filename = self.SAVE_FILE
 
-        data = {
-            "resource": self.resource,
-            "total_rps": self.total_rps,
-            "prestige_points": self.prestige_points,
-            "prestige_multiplier": self.prestige_multiplier,
-            "super_multiplier": self.super_multiplier,
-            "current_multiplier_index": self.current_multiplier_index,
-            "current_page": self.current_page,
-            "button_levels": [button.level for button in self.all_buttons],
-            "save_time": time.time(),
-            "total_ascensions_this_transcendence": self.total_ascensions_this_transcendence,
-            "total_transcendences": self.total_transcendences,
-        }
+        data = self.get_save_data()
         try:
-            with open(filename, "w") as f:
-                json.dump(data, f, indent=2)
+            write_save(filename, data)
             print(f"Game saved to {filename}")
         except Exception as e:
             print("Error saving game:", e)
+            return
+        if filename == self.SAVE_FILE:
+            self.compact_journal(data)
 
     def load_game(self, filename=None):
         """
-        Load and immediately award offline gains. Steps:
-        1. Read JSON. If missing, just return.
-        2. Parse saved resource, saved_rps, and saved_time.
-        3. Compute elapsed = now - saved_time, then break that into days, hours, minutes, seconds.
-        4. Add offline_gain = saved_rps * elapsed to resource.
-        5. Restore button levels, prestige, super multiplier, then recompute total_rps.
-        6. Print exactly how many days/hours/minutes/seconds the game was offline.
+        Load and immediately award offline gains. Returns True if anything was loaded. Steps:
+        1. Read the save (compressed or old JSON). If missing, just return.
+        1b. Replay the journaled actions the save doesn't include yet (the
+           game didn't get to save on quit), see journal.py.
+        2. GameState.load_dict computes elapsed = now - saved_time, adds
+           offline_gain = saved_rps * elapsed to resource and restores button
+           levels, prestige, super multiplier and total_rps.
+        3. Break elapsed into days, hours, minutes, seconds.
+        4. Print exactly how many days/hours/minutes/seconds the game was offline.
         """
         if filename is None:
             filename = self.SAVE_FILE
-
-        if not os.path.exists(filename):
-            return
-
-        try:
-            with open(filename, "r") as f:
-                data = json.load(f)
-        except Exception as e:
-            print("Error loading save file:", e)
-            return
-
-        # 1) Extract saved scalars and arrays
-        saved_resource = data.get("resource", 0.0)
-        saved_rps = data.get("total_rps", 0.0)
-        saved_prestige_points = data.get("prestige_points", 0)
-        saved_prestige_multiplier = data.get("prestige_multiplier", 1.0)
-        saved_super_multiplier = data.get("super_multiplier", 1.0)
-        saved_multiplier_index = data.get("current_multiplier_index", 0)
-        saved_page = data.get("current_page", 0)
-        saved_levels = data.get("button_levels", [])
-        saved_time = data.get("save_time", time.time())
-        saved_total_ascensions_this_transcendence = data.get("total_ascensions_this_transcendence", 0)
-        saved_total_transcendences = data.get("total_transcendences", 0)
-
-        # 2) Compute offline gain
-        now = time.time()
-        elapsed = max(0.0, now - saved_time)
-
-        # Break elapsed seconds into days, hours, minutes, seconds:
+            if not os.path.exists(filename):
+                filename = self.LEGACY_SAVE_FILE
+
+        data = None
+        if os.path.exists(filename):
+            try:
+                data = read_save(filename)
+            except Exception as e:
+                print("Error loading save file:", e)
+                return False
+
+        # 1b) Replay the journal tail on top of the save, then treat the result as the save
+        records = self.journal.records_since(data.get("journal_seq", 0) if data else 0)
+        if records is None:
+            print("Journal starts after the save file; ignoring it.")
+            records = []
+        if data is None and not records:
+            return False
+        if records:
+            start = data.get("save_time", records[0].time) if data else records[0].time
+            if data:
+                self.state.load_dict(data, start)
+            end, ui = replay(self.state, records, start)
+            data = {**(data or {}), **ui, **self.state.to_dict(end)}
+            print(f"Replayed {len(records)} journaled actions.")
+
+        # 1) Restore the economy (including offline gain)
+        offline_gain, elapsed, spent = self.state.load_dict(data, time.time(), self.OFFLINE_POLICY)
+        self.current_multiplier_index = data.get("current_multiplier_index", 0)
+        self.current_page = data.get("current_page", 0)
+        self.stats.load_dict(data.get("stats"))
+        # Milestones passed in saves from before achievements existed (or offline) are earned quietly
+        caught_up = self.milestones.load_list(data.get("achievements"))
+        if caught_up:
+            print(f"{caught_up} achievements earned while away.")
+
+        # 2) Break elapsed seconds into days, hours, minutes, seconds:
         days = int(elapsed // 86400)
         hours = int((elapsed % 86400) // 3600)
         minutes = int((elapsed % 3600) // 60)
         seconds = int(elapsed % 60)
 
-        offline_gain = saved_rps * elapsed
-
-        # 3) Apply values to self
-        self.resource = saved_resource + offline_gain
-        self.prestige_points = saved_prestige_points
-        self.prestige_multiplier = saved_prestige_multiplier
-        self.super_multiplier = saved_super_multiplier
-        self.current_multiplier_index = saved_multiplier_index
-        self.current_page = saved_page
-        self.total_ascensions_this_transcendence = saved_total_ascensions_this_transcendence
-        self.total_transcendences = saved_total_transcendences
-
-        # 4) Restore button levels if they match
-        if len(saved_levels) == len(self.all_buttons):
-            for button, lvl in zip(self.all_buttons, saved_levels):
-                button.level = lvl
-            # Recompute total_rps now that levels are back
-            self.total_rps = sum(btn.get_rps() for btn in self.all_buttons)
-        else:
-            print("Saved button count does not match current button count; skipping level restore.")
-            self.total_rps = 0.0
-
-        # 5) Finally, make sure we show the correct page
+        # 3) Finally, make sure we show the correct page
         self.buttons = self.get_current_page_buttons()
 
-        # 6) Print breakdown
+        # 4) Print breakdown
+        spent_text = f", ${format_number(spent)} of it spent on upgrades" if spent else ""
         print(
             f"Loaded save: +${format_number(offline_gain)} from "
-            f"{days}d {hours}h {minutes}m {seconds}s offline."
+            f"{days}d {hours}h {minutes}m {seconds}s offline{spent_text}."
         )
+        return True
 
-    # —————— END JSON SECTION ——————
+    # —————— END SAVE SECTION ——————
 
     def run(self):
         running = True
-        while running:
-            self.clock.tick(FPS)
+        # Deferred startup: one step per frame, with the loading screen up and only quitting possible
+        while running and self.startup_steps:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    # Save on quit
-                    self.save_game()
+                    self.finish_startup()
+                    self.quit()
                     running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self.draw_loading_screen()
+            if running:
+                self.run_startup_step()
+        self.renderer.invalidate()
 
-                # Forward events to each button
-                for button in self.buttons:
-                    button.parent_game = self
-                    button.handle_event(event, self, self)
-
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if self.click_rect.collidepoint(event.pos):
-                        self.handle_click()
-                    elif self.next_button.collidepoint(event.pos):
-                        self.change_page(1)
-                    elif self.prev_button.collidepoint(event.pos):
-                        self.change_page(-1)
-                    elif self.prestige_button.collidepoint(event.pos):
-                        self.apply_prestige()
-                    elif self.super_prestige_button.collidepoint(event.pos):
-                        self.apply_super_prestige()
-                    elif self.multiplier_button.collidepoint(event.pos):
-                        self.current_multiplier_index = (self.current_multiplier_index + 1) % len(self.purchase_multipliers)
-
-            self.update()
+        while running:
+            # Nobody is looking: keep the economy running but stop burning frames
+            idle = not pygame.key.get_focused() and time.time() - self.last_input_time > IDLE_AFTER
+            self.clock.tick(IDLE_FPS if idle else self.fps)
+            self.simulation.tick_rate = IDLE_TICK_RATE if idle else self.tick_rate
+            self.profiler.begin_frame()
+            with self.profiler.phase("events"):
+                running = self.process_events()
+            if not running:
+                break   # the game has saved and closed its files
+            with self.profiler.phase("update"):
+                self.update()
             self.draw()
+            self.profiler.end_frame()
+            if self.startup_profile is not None:
+                self.mark_startup("first frame")
+                print(self.startup_profile.report())
+                self.startup_profile = None
 
         pygame.quit()
         sys.exit()
 
+    def quit(self):
+        # Apply input still waiting for a tick, let any autosave in flight finish, then save on quit
+        self.simulation.flush()
+        self.autosaver.close()
+        self.save_game()
+        self.journal.close()
+        self.backgrounds.close()
+
+    def process_events(self):
+        """Handle this frame's input. Returns False once the window is closed."""
+        for event in pygame.event.get():
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.KEYDOWN):
+                self.last_input_time = time.time()
+            elif event.type == pygame.VIDEOEXPOSE:
+                self.renderer.invalidate()
+
+            if event.type == pygame.QUIT:
+                # The journal is closed now: nothing later in this batch may record into it
+                self.quit()
+                return False
+            elif event.type == pygame.KEYDOWN and event.key == PROFILER_KEY:
+                self.toggle_profiler()
+            elif event.type == pygame.KEYDOWN and event.key == NOTATION_KEY:
+                next_notation()
+            elif event.type == pygame.KEYDOWN and event.key == STATS_KEY:
+                self.cycle_stats_view()
+
+            # Forward events to each button
+            for button in self.buttons:
+                button.parent_game = self
+                button.handle_event(event, self, self)
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.click_rect.collidepoint(event.pos):
+                    self.handle_click()
+                elif self.next_button.collidepoint(event.pos):
+                    self.change_page(1)
+                elif self.prev_button.collidepoint(event.pos):
+                    self.change_page(-1)
+                elif self.prestige_button.collidepoint(event.pos):
+                    self.simulation.queue(self.apply_prestige)
+                elif self.super_prestige_button.collidepoint(event.pos):
+                    self.simulation.queue(self.apply_super_prestige)
+                elif self.multiplier_button.collidepoint(event.pos):
+                    self.cycle_multiplier()
+        return True
+
 
 # Run the game
 if __name__ == "__main__":
-    pygame.init()
-    game = IdleGame()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Investment Simulator")
+    parser.add_argument("--fps", type=int, default=FPS, help=f"render frame rate (default {FPS})")
+    parser.add_argument("--tick-rate", type=float, default=TICK_RATE,
+                        help=f"economy steps per second (default {TICK_RATE})")
+    parser.add_argument("--jpg", action="store_true", help="load the smaller .jpg backgrounds instead of the .png ones")
+    parser.add_argument("--startup-profile", action="store_true", help="print how long each startup phase took")
+    args = parser.parse_args()
+
+    startup_profile = StartupProfile() if args.startup_profile else None
+    # Only what the game uses: pygame.init() would also open the audio device and joysticks
+    pygame.display.init()
+    pygame.font.init()
+    if startup_profile is not None:
+        startup_profile.mark("pygame init")
+    game = IdleGame(fps=args.fps, tick_rate=args.tick_rate, prefer_jpg=args.jpg,
+                    deferred=True, startup_profile=startup_profile)
     game.run()
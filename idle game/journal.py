@@ -0,0 +1,222 @@
+"""
+Append-only binary journal of player actions, replayed on top of the last save.
+
+File layout:
+
+    b"IDLJ" | version (1 byte) | sequence number of the first record (8 bytes)
+    then one 19-byte record per action:
+    time (float64) | action (1 byte) | tier index (2 bytes) | value (int64)
+
+All little endian. "time" is the economy time the action was applied at
+(FixedStepSimulation.time), so replaying is: tick up to the record's time,
+apply it, repeat. Each save snapshot stores the sequence number of the next
+record ("journal_seq"); once that snapshot is on disk the journal is compacted
+down to the records after it. A torn record at the end (crash mid-write) is
+ignored.
+
+Replay a journal headless, as fast as it goes:
+
+    python journal.py save.journal --snapshot save.dat
+    python journal.py playtest.archive --verify save.dat
+"""
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+MAGIC = b"IDLJ"
+JOURNAL_VERSION = 1
+HEADER = struct.Struct("<4sBQ")
+RECORD = struct.Struct("<dBHq")
+
+# Actions; `index` is the tier for BUY, `value` the levels bought / new page / new multiplier index
+BUY = 1
+CLICK = 2
+ASCEND = 3
+TRANSCEND = 4
+PAGE = 5
+MULTIPLIER = 6
+
+JournalRecord = namedtuple("JournalRecord", ["time", "action", "index", "value"])
+
+
+def read_journal(filename):
+    """Returns (sequence number of the first record, records). A missing file is an empty journal."""
+    try:
+        with open(filename, "rb") as f:
+            blob = f.read()
+    except FileNotFoundError:
+        return 0, []
+    if len(blob) < HEADER.size:
+        return 0, []
+    magic, version, base_seq = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError(f"{filename} is not an action journal")
+    if version > JOURNAL_VERSION:
+        raise ValueError(f"journal version {version} is newer than this game ({JOURNAL_VERSION})")
+    end = HEADER.size + (len(blob) - HEADER.size) // RECORD.size * RECORD.size
+    return base_seq, [JournalRecord._make(r) for r in RECORD.iter_unpack(blob[HEADER.size:end])]
+
+
+class ActionJournal:
+    """
+    The open journal file of one game.
+
+    record() only appends to a buffer; flush() hands it to the OS and is cheap
+    enough to call every frame. compact() may run on the autosave thread.
+    With an `archive` file, compacted records are moved there instead of
+    being dropped, so the whole session stays replayable (e.g. for playtests).
+    """
+
+    def __init__(self, filename, archive=None):
+        self.filename = filename
+        self.archive = archive
+        self.lock = threading.Lock()
+        self.base_seq, records = read_journal(filename)
+        self.seq = self.base_seq + len(records)
+        # Rewrite once on open: drops a torn last record and makes sure the header exists
+        self._rewrite(self.base_seq, records)
+
+    def _rewrite(self, base_seq, records):
+        temp_name = f"{self.filename}.tmp"
+        with open(temp_name, "wb") as f:
+            f.write(HEADER.pack(MAGIC, JOURNAL_VERSION, base_seq))
+            f.writelines(RECORD.pack(*record) for record in records)
+        os.replace(temp_name, self.filename)
+        self.base_seq = base_seq
+        self.file = open(self.filename, "ab")
+
+    def record(self, when, action, index=0, value=0):
+        with self.lock:
+            self.file.write(RECORD.pack(when, action, index, value))
+            self.seq += 1
+
+    def flush(self):
+        with self.lock:
+            self.file.flush()
+
+    def records_since(self, seq):
+        """Records from sequence number `seq` on, or None if the journal no longer reaches back that far."""
+        with self.lock:
+            self.file.flush()
+            base_seq, records = read_journal(self.filename)
+        if seq < base_seq:
+            return None
+        return records[seq - base_seq:]
+
+    def compact(self, seq):
+        """Drop (or archive) the records before sequence number `seq`, which a saved snapshot now covers."""
+        with self.lock:
+            self.file.close()
+            base_seq, records = read_journal(self.filename)
+            done = max(0, min(seq - base_seq, len(records)))
+            if self.archive is not None and done:
+                archive_base, archived = read_journal(self.archive)
+                if not archived:
+                    archive_base = base_seq
+                if archive_base + len(archived) == base_seq:
+                    with open(self.archive, "ab" if archived else "wb") as f:
+                        if not archived:
+                            f.write(HEADER.pack(MAGIC, JOURNAL_VERSION, archive_base))
+                        f.writelines(RECORD.pack(*record) for record in records[:done])
+                else:
+                    print("Journal archive does not continue this journal; not archiving.")
+            self._rewrite(base_seq + done, records[done:])
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+def apply_record(state, record):
+    """Apply one economy action to a GameState. UI-only actions are ignored."""
+    action = record.action
+    if action == BUY:
+        state.buy(record.index, record.value)
+    elif action == CLICK:
+        state.click()
+    elif action == ASCEND:
+        state.apply_prestige()
+    elif action == TRANSCEND:
+        state.apply_super_prestige()
+
+
+def replay(state, records, start_time):
+    """
+    Replay records onto `state`, which must be as of `start_time`.
+
+    Returns (time of the last record, ui) where ui holds the last
+    "current_page" / "current_multiplier_index" the journal set, if any.
+    """
+    now = start_time
+    ui = {}
+    for record in records:
+        if record.time > now:
+            state.tick(record.time - now)
+            now = record.time
+        if record.action == PAGE:
+            ui["current_page"] = record.value
+        elif record.action == MULTIPLIER:
+            ui["current_multiplier_index"] = record.value
+        else:
+            apply_record(state, record)
+    return now, ui
+
+
+def main():
+    import argparse
+
+    from economy import GameState
+    from number_format import format_number
+    from savefile import read_save
+
+    parser = argparse.ArgumentParser(description="Replay an action journal without rendering.")
+    parser.add_argument("journal", help="journal or journal archive to replay")
+    parser.add_argument("--snapshot", help="save file the journal continues (default: a new game)")
+    parser.add_argument("--verify", metavar="SAVE", help="compare the replayed state with this save file")
+    args = parser.parse_args()
+
+    base_seq, records = read_journal(args.journal)
+    state = GameState()
+    start_time = records[0].time if records else 0.0
+    skip = 0
+    if args.snapshot:
+        snapshot = read_save(args.snapshot)
+        start_time = snapshot.get("save_time", start_time)
+        state.load_dict(snapshot, start_time)
+        skip = snapshot.get("journal_seq", 0) - base_seq
+        if skip < 0:
+            parser.error("the journal starts after the snapshot; nothing connects them")
+    elif base_seq:
+        parser.error(f"the journal starts at record {base_seq}; pass the snapshot it continues with --snapshot")
+    records = records[skip:]
+
+    started = time.perf_counter()
+    end_time, _ = replay(state, records, start_time)
+    elapsed = time.perf_counter() - started
+
+    print(f"Replayed {len(records)} actions covering {end_time - start_time:.0f}s of play "
+          f"in {elapsed:.3f}s ({len(records) / elapsed if elapsed else 0:.0f} actions/s)")
+    print(f"resource ${format_number(state.resource)}, {format_number(state.total_rps)}/s, "
+          f"{state.total_levels} levels, {state.prestige_points} Ascension Points, "
+          f"super multiplier {state.super_multiplier:.3f}")
+
+    if args.verify:
+        expected = read_save(args.verify)
+        # Bring the replay to the same moment as the save before comparing
+        state.tick(max(0.0, expected.get("save_time", end_time) - end_time))
+        reference = GameState()
+        reference.load_dict(expected, expected.get("save_time", end_time))
+        levels_match = [t.level for t in state.tiers] == [t.level for t in reference.tiers]
+        difference = state.resource - reference.resource
+        if reference.resource:
+            difference = difference / reference.resource
+        difference = abs(float(difference))
+        print(f"levels {'match' if levels_match else 'DIFFER'}, "
+              f"prestige {'matches' if state.prestige_points == reference.prestige_points else 'DIFFERS'}, "
+              f"resource relative difference {difference:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Milestones and achievements, checked only when the number they watch moves.
+
+Every milestone watches one stat of a GameState (a tier's level, the highest
+tier owned, resource, Ascensions, Transcendences) and is reached once that
+stat is at least its threshold. The milestones of each stat sit in a
+ThresholdIndex sorted by threshold, so a change of the stat is one bisect,
+plus a callback for each milestone actually crossed. Nothing is scanned per
+frame: buys and resets tell the engine which stats moved, and resource, the
+one stat that moves on its own, is a single comparison against the next
+threshold.
+
+Unlocks (the arcs and Ascension) are milestones too. They can be lost again,
+since every Ascension and Transcendence goes back to Arc I; achievements are
+earned once and stay earned.
+"""
+from bisect import bisect_right
+from collections import namedtuple
+
+from bignum import BigNum
+from economy import ARC_TIER_INDICES, PRESTIGE_TIER_INDEX, TIER_NAMES_FLAT
+from number_format import format_number
+
+# stat: "level" (of tier `index`), "highest_tier", "resource", "ascensions" or "transcendences".
+# unlock: True for unlocks, which are lost again when the stat drops below the threshold.
+Milestone = namedtuple("Milestone", ["key", "stat", "index", "threshold", "title", "unlock"])
+
+# What owning each arc's first tier unlocks, in ARC_TIER_INDICES order
+ARC_UNLOCKS = [
+    "Luxuries Arc", "Power Arc", "Solar Neighborhood Arc",
+    "Galactic Structures Arc", "Beyond Comprehension Arc", "Singularity Arc",
+]
+
+# Achievement thresholds
+TIER_LEVEL_MARKS = (25, 100, 200, 500, 1000)
+RESOURCE_MARK_STEP = 3           # an achievement every 10^3 dollars...
+RESOURCE_MARK_MAX = 300          # ...up to $1e300
+ASCENSION_MARKS = (1, 5, 10, 25, 50, 100)
+TRANSCENDENCE_MARKS = (1, 3, 10, 25)
+
+
+def stat_value(state, stat, index=0):
+    if stat == "level":
+        return state.tiers[index].level
+    if stat == "highest_tier":
+        return state.highest_owned
+    if stat == "resource":
+        return state.resource
+    if stat == "ascensions":
+        return state.total_ascensions_this_transcendence
+    if stat == "transcendences":
+        return state.total_transcendences
+    raise ValueError(f"unknown stat {stat!r}")
+
+
+def create_milestones():
+    """Every unlock and achievement of the game."""
+    milestones = [
+        Milestone(f"unlock:{tier}", "highest_tier", 0, tier, title, True)
+        for tier, title in zip(ARC_TIER_INDICES, ARC_UNLOCKS)
+    ]
+    milestones.append(Milestone(f"unlock:{PRESTIGE_TIER_INDEX}", "highest_tier", 0, PRESTIGE_TIER_INDEX,
+                                "Ascension", True))
+    for index, name in enumerate(TIER_NAMES_FLAT):
+        for level in TIER_LEVEL_MARKS:
+            milestones.append(Milestone(f"level:{index}:{level}", "level", index, level, f"{level} x {name}", False))
+    for exponent in range(RESOURCE_MARK_STEP, RESOURCE_MARK_MAX + 1, RESOURCE_MARK_STEP):
+        amount = BigNum.from_log10(exponent)
+        milestones.append(Milestone(f"resource:{exponent}", "resource", 0, amount,
+                                    f"${format_number(amount)} at once", False))
+    for count in ASCENSION_MARKS:
+        milestones.append(Milestone(f"ascensions:{count}", "ascensions", 0, count,
+                                    f"{count} Ascensions in one Transcendence", False))
+    for count in TRANSCENDENCE_MARKS:
+        milestones.append(Milestone(f"transcendences:{count}", "transcendences", 0, count,
+                                    f"{count} Transcendences", False))
+    return milestones
+
+
+def unlocks_by_tier(milestones):
+    """{tier index: titles of what owning that tier unlocks}, for the tooltips."""
+    unlocks = {}
+    for milestone in milestones:
+        if milestone.unlock and milestone.stat == "highest_tier":
+            unlocks.setdefault(milestone.threshold, []).append(milestone.title)
+    return unlocks
+
+
+class ThresholdIndex:
+    """The milestones of one stat, sorted by threshold, and how many of them the stat is past."""
+
+    def __init__(self, milestones):
+        self.milestones = sorted(milestones, key=lambda m: m.threshold)
+        self.thresholds = [m.threshold for m in self.milestones]
+        self.position = 0      # milestones[:position] are at or below the last value seen
+        self.next = self.thresholds[0] if self.thresholds else None
+
+    def move(self, value):
+        """Returns (milestones crossed going up, milestones crossed going down) since the last value."""
+        position = bisect_right(self.thresholds, value)
+        previous = self.position
+        if position == previous:
+            return (), ()
+        self.position = position
+        self.next = self.thresholds[position] if position < len(self.thresholds) else None
+        if position > previous:
+            return self.milestones[previous:position], ()
+        return (), self.milestones[position:previous]
+
+
+class MilestoneEngine:
+    """
+    Fires callbacks as a GameState crosses milestone thresholds.
+
+    on_reached callbacks get (milestone, first_time); on_lost callbacks get
+    (milestone) and only ever see unlocks. `earned` holds the key of every
+    milestone ever reached and is what the save file keeps.
+    """
+
+    def __init__(self, state, milestones=None):
+        self.state = state
+        self.milestones = create_milestones() if milestones is None else milestones
+        self.earned = set()
+        self.on_reached = []
+        self.on_lost = []
+        groups = {}
+        for milestone in self.milestones:
+            groups.setdefault((milestone.stat, milestone.index), []).append(milestone)
+        self.indexes = {stat: ThresholdIndex(group) for stat, group in groups.items()}
+        self.resource_index = self.indexes.get(("resource", 0))
+
+    def update(self, stat, index=0, notify=True):
+        """Re-read one stat after it changed."""
+        threshold_index = self.indexes.get((stat, index))
+        if threshold_index is None:
+            return
+        reached, lost = threshold_index.move(stat_value(self.state, stat, index))
+        for milestone in reached:
+            first_time = milestone.key not in self.earned
+            self.earned.add(milestone.key)
+            if notify and (first_time or milestone.unlock):
+                for callback in self.on_reached:
+                    callback(milestone, first_time)
+        if notify:
+            for milestone in lost:
+                if milestone.unlock:
+                    for callback in self.on_lost:
+                        callback(milestone)
+
+    def bought(self, index):
+        self.update("level", index)
+        self.update("highest_tier")
+
+    def check_resource(self):
+        # The per-frame check: one comparison until the next threshold is actually crossed
+        resource_index = self.resource_index
+        if resource_index is None:
+            return
+        if resource_index.next is not None and self.state.resource >= resource_index.next:
+            self.update("resource")
+
+    def refresh(self, notify=True):
+        """Re-read every stat, after a reset or a load changed many at once."""
+        for stat, index in self.indexes:
+            self.update(stat, index, notify)
+
+    # --- Save data ---
+
+    def to_list(self):
+        return sorted(self.earned)
+
+    def load_list(self, keys):
+        """Restore earned milestones and catch up silently with the loaded state."""
+        self.earned = set(keys or ())
+        before = len(self.earned)
+        self.refresh(notify=False)
+        return len(self.earned) - before
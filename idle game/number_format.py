@@ -0,0 +1,111 @@
+"""
+Number formatting for the UI: $1.23M, $4.56Qa, 7.890e+70, ...
+
+The suffix is picked in one step from the number's decimal exponent, using
+the same table the in-game "number format" tooltip is generated from.
+"""
+import math
+from functools import lru_cache
+
+from bignum import BigNum
+
+# Short suffix and full name for every power of 1000 from a million up
+NUMBER_SUFFIXES = [
+    ("M", "Million"),
+    ("B", "Billion"),
+    ("T", "Trillion"),
+    ("Qa", "Quadrillion"),
+    ("Qi", "Quintillion"),
+    ("Sx", "Sextillion"),
+    ("Sp", "Septillion"),
+    ("Oc", "Octillion"),
+    ("No", "Nonillion"),
+    ("Dc", "Decillion"),
+    ("Ud", "Undecillion"),
+    ("Dd", "Duodecillion"),
+    ("Td", "Tredecillion"),
+    ("Qad", "Quattuordecillion"),
+    ("Qid", "Quindecillion"),
+    ("Sxd", "Sexdecillion"),
+    ("Spd", "Septendecillion"),
+    ("Ocd", "Octodecillion"),
+    ("Nod", "Novemdecillion"),
+    ("Vi", "Vigintillion"),
+]
+
+NUMBER_FORMAT_TOOLTIP = "\n".join(
+    [f"{suffix} = {name}" for suffix, name in NUMBER_SUFFIXES] + ["e+XX = Scientific Notation"]
+)
+
+# Lower bound of each suffix: 1e6, 1e9, ... 1e63. Past the table only scientific notation is left.
+SUFFIX_THRESHOLDS = [float(f"1e{6 + 3 * i}") for i in range(len(NUMBER_SUFFIXES))]
+SCIENTIFIC_FROM = float(f"1e{6 + 3 * len(NUMBER_SUFFIXES)}")
+
+# "suffix" is the default; the others apply from a million up
+NOTATIONS = ("suffix", "engineering", "scientific")
+current_notation = "suffix"
+
+
+def set_notation(name):
+    global current_notation
+    if name not in NOTATIONS:
+        raise ValueError(f"unknown notation {name!r}, expected one of {NOTATIONS}")
+    current_notation = name
+
+
+def next_notation():
+    """Switch to the notation after the current one and return its name."""
+    set_notation(NOTATIONS[(NOTATIONS.index(current_notation) + 1) % len(NOTATIONS)])
+    return current_notation
+
+
+def format_number(n, notation=None):
+    if notation is None:
+        notation = current_notation
+    if isinstance(n, BigNum):
+        # Only values past the float range need BigNum's own formatting
+        if n.e >= 300:
+            if notation == "engineering":
+                return _engineering(n.m, n.e)
+            return f"{n:.3e}"
+        n = float(n)
+    if n == 0:
+        # 0.0 and -0.0 share a cache key but not their output
+        return _format(n, notation)
+    return _format_cached(n, notation)
+
+
+def _format(n, notation):
+    if n >= 1e6 and notation == "engineering" and n != math.inf:
+        exponent = math.floor(math.log10(n))
+        return _engineering(n / 10.0 ** exponent, exponent)
+    if n >= SCIENTIFIC_FROM or (n >= 1e6 and notation == "scientific"):
+        return f"{n:.3e}"
+    if n >= 1e6:
+        exponent = math.floor(math.log10(n))
+        index = min(exponent // 3 - 2, len(SUFFIX_THRESHOLDS) - 1)
+        # log10 can round across a power of ten; settle it with the same comparisons as before
+        if n < SUFFIX_THRESHOLDS[index]:
+            index -= 1
+        elif index + 1 < len(SUFFIX_THRESHOLDS) and n >= SUFFIX_THRESHOLDS[index + 1]:
+            index += 1
+        return f"{n / SUFFIX_THRESHOLDS[index]:.2f}{NUMBER_SUFFIXES[index][0]}"
+    if n >= 1e2:
+        return f"{n:,.0f}"
+    return f"{n:,.2f}"
+
+
+# Most frames format the same few dozen values again
+_format_cached = lru_cache(maxsize=4096)(_format)
+
+
+def _engineering(mantissa, exponent):
+    # mantissa * 10**exponent with the exponent a multiple of 3, e.g. 12.35e+09
+    if mantissa >= 10:
+        mantissa, exponent = mantissa / 10, exponent + 1
+    shift = exponent % 3
+    mantissa *= 10 ** shift
+    exponent -= shift
+    if round(mantissa, 2) >= 1000:
+        mantissa, exponent = mantissa / 1000, exponent + 3
+    return f"{mantissa:.2f}e+{exponent:02d}"
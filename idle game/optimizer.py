@@ -0,0 +1,143 @@
+"""
+Purchase-order optimizer: which purchase pays for itself soonest?
+
+A purchase is scored by the time until it has paid for itself counted from
+now: the wait until it is affordable, (cost - resource) / total RPS, plus its
+payback time, cost / the RPS it adds. Ranking by payback alone always picks
+the newest tier (a first level always pays back in 50s), however far out of
+reach it is. Everything is scored in log10 floats, so no BigNum math happens
+on the hot path.
+"""
+import bisect
+import math
+
+from economy import COST_GROWTH, LOG10_COST_GROWTH, MILESTONE_START, levels_to_next_milestone, milestone_bonus_log10
+
+# log10 of the geometric-series factor for buying `count` levels at once,
+# for every count a milestone run can need (at most MILESTONE_START levels)
+BULK_FACTOR_LOG10 = [0.0] + [
+    math.log10((COST_GROWTH ** count - 1) / (COST_GROWTH - 1)) for count in range(1, MILESTONE_START + 1)
+]
+
+
+def bulk_factor_log10(count):
+    if count < len(BULK_FACTOR_LOG10):
+        return BULK_FACTOR_LOG10[count]
+    return count * LOG10_COST_GROWTH - math.log10(COST_GROWTH - 1)
+
+
+def payback_log10(tier, count):
+    """log10 of (cost of the next `count` levels) / (RPS they add), before prestige."""
+    level = tier.level
+    cost_log10 = tier.get_cost_log10() + bulk_factor_log10(count)
+
+    # rps(L) = base * L * bonus(L), so rps(L + k) - rps(L) = base * bonus(L) * ((L + k) * bonus ratio - L)
+    bonus_log10 = milestone_bonus_log10(level)
+    ratio = 10 ** (milestone_bonus_log10(level + count) - bonus_log10)
+    gain_log10 = tier.rps_base_log10 + bonus_log10 + math.log10((level + count) * ratio - level)
+    return cost_log10 - gain_log10
+
+
+def best_candidate(tier):
+    """
+    The purchase of `tier` with the shortest payback: one level, or every level
+    up to the next milestone when the RPS jump there makes the run worth it.
+    Returns (payback_log10, count, cost_log10).
+    """
+    best = (payback_log10(tier, 1), 1)
+    to_milestone = levels_to_next_milestone(tier.level)
+    if to_milestone is not None and to_milestone > 1:
+        best = min(best, (payback_log10(tier, to_milestone), to_milestone))
+    score, count = best
+    return score, count, tier.get_cost_log10() + bulk_factor_log10(count)
+
+
+def seconds_from_log10(value_log10):
+    return 10 ** value_log10 if value_log10 < 300 else math.inf
+
+
+def wait_seconds(cost_log10, resource_log10, rps_log10):
+    """(cost - resource) / rps, or 0 if affordable already, from log10 values (None for zero)."""
+    if resource_log10 is not None and resource_log10 >= cost_log10:
+        return 0.0
+    if rps_log10 is None:
+        return math.inf
+    wait = seconds_from_log10(cost_log10 - rps_log10)
+    if resource_log10 is not None:
+        wait *= 1 - 10 ** (resource_log10 - cost_log10)
+    return wait
+
+
+class PaybackOptimizer:
+    """
+    Keeps the unlocked tiers' best purchases sorted by payback time.
+
+    A purchase only changes the price and RPS of the tier that was bought, so
+    after one only that tier is rescored and moved. recommend() adds the wait
+    for the current resource and RPS, walking the list in payback order: a
+    purchase can never pay for itself sooner than its payback time, so the
+    walk stops as soon as that alone exceeds the best total found.
+
+    Also usable directly as a GameState.fast_forward policy.
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self.rebuild()
+
+    def rebuild(self):
+        """Rescore every unlocked tier from scratch."""
+        self.levels = self.state.catalog.copy_levels()
+        self.candidates = {}   # index -> (payback_log10, count, cost_log10)
+        self.order = []        # (payback_log10, index), ascending
+        self.unlocked = 0
+        self.sync()
+
+    def update(self, index):
+        tier = self.state.tiers[index]
+        self.levels[index] = tier.level
+        old = self.candidates.get(index)
+        if old is not None:
+            del self.order[bisect.bisect_left(self.order, (old[0], index))]
+        self.candidates[index] = candidate = best_candidate(tier)
+        bisect.insort(self.order, (candidate[0], index))
+
+    def sync(self):
+        """Pick up purchases, resets and unlocks made on the state since the last call."""
+        catalog = self.state.catalog
+        if len(self.levels) != len(catalog):
+            # Tiers were added to the catalog
+            self.rebuild()
+            return
+        # Compared a whole column at a time rather than tier by tier
+        for index in catalog.changed_levels(self.levels):
+            self.update(index)
+
+        unlocked = min(self.state.highest_owned + 2, len(catalog))
+        for index in range(self.unlocked, unlocked):
+            self.update(index)
+        self.unlocked = unlocked
+
+    def recommend(self):
+        """The next purchase as (tier_index, levels), or None if nothing is unlocked."""
+        self.sync()
+        state = self.state
+        resource_log10 = state.resource.log10() if state.resource > 0 else None
+        rps_log10 = state.total_rps.log10() if state.total_rps > 0 else None
+        prestige_log10 = math.log10(state.prestige_multiplier)
+        best = best_key = None
+        for score, index in self.order:
+            if index >= self.unlocked:
+                continue   # locked again by a reset; rescored when it unlocks
+            payback = seconds_from_log10(score - prestige_log10)
+            if best_key is not None and payback > best_key[0]:
+                break
+            _, count, cost_log10 = self.candidates[index]
+            # With no income nothing unaffordable ever pays back; the cheapest is then the one to click for
+            key = (wait_seconds(cost_log10, resource_log10, rps_log10) + payback, cost_log10)
+            if best_key is None or key < best_key:
+                best, best_key = (index, count), key
+        return best
+
+    def __call__(self, state):
+        return self.recommend()
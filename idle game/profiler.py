@@ -0,0 +1,155 @@
+"""
+Per-frame timing of the game loop, split into named phases.
+
+    profiler.begin_frame()
+    with profiler.phase("update"):
+        ...
+    profiler.end_frame()
+
+Every finished frame is kept in a short history (for the F3 overlay) and
+handed to each listener, e.g. a CsvRingLogger:
+
+    logger = CsvRingLogger("frames.csv")
+    game.profiler.add_listener(logger)
+    ...
+    logger.write()
+
+Startup is timed separately, by a StartupProfile (idle-game.py --startup-profile).
+"""
+import csv
+import time
+from collections import deque, namedtuple
+from contextlib import nullcontext
+
+# `phases` maps phase name -> seconds spent in it during the frame
+FrameRecord = namedtuple("FrameRecord", ["index", "start", "total", "phases"])
+
+_NOT_TIMING = nullcontext()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+
+
+class FrameProfiler:
+    """
+    Collects phase timings while `enabled`; costs next to nothing otherwise.
+
+    Frame totals cover begin_frame to end_frame, i.e. the work done per
+    frame without the clock.tick sleep, which is what has to fit the budget.
+    """
+
+    def __init__(self, history=300):
+        self.enabled = False
+        self.frames = deque(maxlen=history)
+        self.listeners = []
+        self.frame_count = 0
+        self.current = None
+        self.frame_start = 0.0
+
+    def add_listener(self, listener):
+        """Call listener(FrameRecord) after every frame. Turns profiling on."""
+        self.listeners.append(listener)
+        self.enabled = True
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    @property
+    def timing(self):
+        # True between begin_frame and end_frame of a profiled frame
+        return self.current is not None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def phase(self, name):
+        if self.current is None:
+            return _NOT_TIMING
+        return _Phase(self, name)
+
+    def add(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def end_frame(self):
+        if self.current is None:
+            return
+        record = FrameRecord(self.frame_count, self.frame_start, time.perf_counter() - self.frame_start, self.current)
+        self.current = None
+        self.frame_count += 1
+        self.frames.append(record)
+        for listener in self.listeners:
+            listener(record)
+
+    def percentile(self, percent):
+        """Frame total (seconds) below which `percent`% of the recent frames fall."""
+        if not self.frames:
+            return 0.0
+        totals = sorted(frame.total for frame in self.frames)
+        return totals[min(len(totals) - 1, int(len(totals) * percent / 100))]
+
+    def phase_averages(self):
+        """Mean seconds per frame of each phase over the recent frames, in first-seen order."""
+        sums = {}
+        for frame in self.frames:
+            for name, seconds in frame.phases.items():
+                sums[name] = sums.get(name, 0.0) + seconds
+        count = len(self.frames) or 1
+        return {name: total / count for name, total in sums.items()}
+
+
+class CsvRingLogger:
+    """Profiler listener that keeps the last `size` frames and writes them as CSV on demand."""
+
+    def __init__(self, filename, size=3600):
+        self.filename = filename
+        self.records = deque(maxlen=size)
+
+    def __call__(self, record):
+        self.records.append(record)
+
+    def write(self):
+        phases = []
+        for record in self.records:
+            phases.extend(name for name in record.phases if name not in phases)
+        with open(self.filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "start", "total_ms"] + [f"{name}_ms" for name in phases])
+            for record in self.records:
+                writer.writerow(
+                    [record.index, f"{record.start:.6f}", f"{record.total * 1000:.3f}"]
+                    + [f"{record.phases.get(name, 0.0) * 1000:.3f}" for name in phases]
+                )
+
+
+class StartupProfile:
+    """Wall-clock time of each startup phase; each mark() ends the phase that began at the previous one."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last, now - self.start))
+        self.last = now
+
+    def report(self):
+        lines = [f"{'startup phase':<24}{'ms':>9}{'since start':>13}"]
+        for name, seconds, elapsed in self.phases:
+            lines.append(f"{name:<24}{seconds * 1000:>9.1f}{elapsed * 1000:>13.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,133 @@
+"""
+Save file encoding, atomic writes and background autosave.
+
+Saves are compact JSON, zlib-compressed, behind a small header:
+
+    b"IDLS" | format version (1 byte) | CRC32 of the JSON (4 bytes, big endian) | zlib data
+
+Old pretty-printed JSON saves (no header) are still read.
+"""
+import json
+import os
+import struct
+import tempfile
+import threading
+import zlib
+
+MAGIC = b"IDLS"
+SAVE_VERSION = 1
+HEADER = struct.Struct(">4sBI")
+
+
+def _to_json(value):
+    # Snapshot objects (e.g. stats.StatsSnapshot) are converted here, off the frame loop when autosaving
+    if hasattr(value, "to_json"):
+        return value.to_json()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_save(data):
+    raw = json.dumps(data, separators=(",", ":"), default=_to_json).encode("utf-8")
+    return HEADER.pack(MAGIC, SAVE_VERSION, zlib.crc32(raw)) + zlib.compress(raw, 6)
+
+
+def decode_save(blob):
+    """Parse a save blob in either the current format or the old plain JSON."""
+    if not blob.startswith(MAGIC):
+        return json.loads(blob.decode("utf-8"))
+
+    if len(blob) < HEADER.size:
+        raise ValueError("save file header is truncated")
+    _, version, checksum = HEADER.unpack_from(blob)
+    if version > SAVE_VERSION:
+        raise ValueError(f"save file version {version} is newer than this game ({SAVE_VERSION})")
+    try:
+        raw = zlib.decompress(blob[HEADER.size:])
+    except zlib.error as e:
+        raise ValueError(f"save file is corrupt: {e}") from e
+    if zlib.crc32(raw) != checksum:
+        raise ValueError("save file checksum mismatch")
+    return json.loads(raw.decode("utf-8"))
+
+
+def write_save(filename, data):
+    """
+    Write atomically: temp file in the same directory, fsync, then rename over
+    the old save. A crash at any point leaves either the old or the new file.
+    Every write gets its own temp file, so concurrent writers never share one.
+    """
+    blob = encode_save(data)
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(filename)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, filename)
+    except BaseException:
+        os.remove(temp_name)
+        raise
+
+    # Persist the rename itself (not supported on Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def read_save(filename):
+    with open(filename, "rb") as f:
+        return decode_save(f.read())
+
+
+class Autosaver:
+    """
+    Writes save snapshots on a background thread.
+
+    submit() only hands over an already-built snapshot dict, so the frame loop
+    never waits on compression or disk. If snapshots arrive faster than they
+    can be written, only the newest one is kept. on_saved(data) runs on the
+    autosave thread after each successful write.
+    """
+
+    def __init__(self, filename, on_saved=None):
+        self.filename = filename
+        self.on_saved = on_saved
+        self.pending = None
+        self.closed = False
+        self.last_error = None
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self.thread.start()
+
+    def submit(self, data):
+        with self.condition:
+            self.pending = data
+            self.condition.notify()
+
+    def close(self):
+        """Write anything still pending and stop the thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                data, self.pending = self.pending, None
+                if data is None:
+                    return
+            try:
+                write_save(self.filename, data)
+            except Exception as e:
+                self.last_error = e
+                print("Error autosaving game:", e)
+                continue
+            if self.on_saved is not None:
+                self.on_saved(data)
@@ -0,0 +1,63 @@
+"""
+Fixed-timestep driver for the economy, decoupled from the render frame rate.
+"""
+from collections import deque
+
+
+class FixedStepSimulation:
+    """
+    Advances a GameState in steps of exactly 1 / tick_rate seconds.
+
+    The render loop calls advance(now) once per frame, however often that is;
+    leftover time carries over to the next frame. Player actions are queued
+    and applied at the start of the next step, so they always land between
+    ticks no matter when the input arrived.
+    """
+    # A stall longer than this many steps (window dragged, laptop asleep) is
+    # paid out in one lump; income is linear, so nothing is lost by it
+    MAX_STEPS_PER_ADVANCE = 1000
+
+    def __init__(self, state, tick_rate, now):
+        self.state = state
+        self.tick_rate = tick_rate
+        self.last_time = now
+        self.time = now   # economy time: where the ticks so far have brought the state
+        self.accumulator = 0.0
+        self.actions = deque()
+        self.ticks = 0
+
+    def queue(self, action, *args):
+        """Run action(*args) before the next tick."""
+        self.actions.append((action, args))
+
+    def flush(self):
+        """Apply queued actions right away (e.g. before saving on quit). They apply at `time`."""
+        actions = self.actions
+        while actions:
+            action, args = actions.popleft()
+            action(*args)
+
+    def step(self, seconds):
+        self.flush()
+        # Tick by the difference of the timestamps, not `seconds` itself: a journal
+        # replay ticks from timestamp to timestamp, and differences of floats this
+        # close are exact, so both add up to the same income
+        end = self.time + seconds
+        self.state.tick(end - self.time)
+        self.time = end
+        self.ticks += 1
+
+    def advance(self, now):
+        """Run every whole step that fits in the time since the last call. Returns the steps run."""
+        self.accumulator += max(0.0, now - self.last_time)
+        self.last_time = now
+        dt = 1.0 / self.tick_rate
+        steps = int(self.accumulator / dt)
+
+        run = min(steps, self.MAX_STEPS_PER_ADVANCE)
+        if steps > run:
+            self.step((steps - run) * dt)
+        for _ in range(run):
+            self.step(dt)
+        self.accumulator -= steps * dt
+        return steps
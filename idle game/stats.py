@@ -0,0 +1,166 @@
+"""
+History of the headline numbers at several resolutions, in bounded memory.
+
+The game calls record() about once a second. Each resolution averages the
+samples that fall into its current bucket (a second, a minute, an hour) and,
+once the bucket is over, pushes the mean into a fixed-size ring buffer.
+Buckets with no samples at all (game closed, long stall) are pushed as gaps
+(NaN), so a position in a ring always maps to the same point in time.
+resource and total_rps are kept as log10, which is also how they are graphed.
+"""
+import math
+from array import array
+
+FIELDS = ("resource_log10", "rps_log10", "prestige_points", "super_multiplier")
+
+# name, seconds per sample, samples kept
+RESOLUTIONS = (
+    ("second", 1, 600),      # last 10 minutes
+    ("minute", 60, 1440),    # last day
+    ("hour", 3600, 2160),    # last 90 days
+)
+
+STATS_VERSION = 1
+NAN = float("nan")
+
+
+def log10_or_nan(value):
+    return value.log10() if value > 0 else NAN
+
+
+class RingBuffer:
+    """`size` float slots in an array; once full, each append overwrites the oldest."""
+
+    def __init__(self, size):
+        self.size = size
+        self.data = array("d", [NAN]) * size
+        self.next = 0    # slot the next value goes into
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.next] = value
+        self.next = (self.next + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def values(self):
+        """Oldest first."""
+        if self.count < self.size:
+            return self.data[:self.count]
+        return self.data[self.next:] + self.data[:self.next]
+
+
+class Series:
+    """One resolution: a ring per field, plus the bucket currently being averaged."""
+
+    def __init__(self, interval, size):
+        self.interval = interval
+        self.rings = [RingBuffer(size) for _ in FIELDS]
+        self.bucket = None   # now // interval of the bucket being filled
+        self.sums = [0.0] * len(FIELDS)
+        self.counts = [0] * len(FIELDS)
+
+    def add(self, now, values):
+        bucket = int(now // self.interval)
+        if self.bucket is None:
+            self.bucket = bucket
+        elif bucket > self.bucket:
+            self.push()
+            # One gap per bucket nobody recorded in, but never more than a ring holds
+            for _ in range(min(bucket - self.bucket - 1, self.rings[0].size)):
+                for ring in self.rings:
+                    ring.append(NAN)
+            self.bucket = bucket
+        # (a clock that went backwards just keeps filling the current bucket)
+        for i, value in enumerate(values):
+            if value == value:   # skip NaN
+                self.sums[i] += value
+                self.counts[i] += 1
+
+    def push(self):
+        for i, ring in enumerate(self.rings):
+            ring.append(self.sums[i] / self.counts[i] if self.counts[i] else NAN)
+        self.sums = [0.0] * len(FIELDS)
+        self.counts = [0] * len(FIELDS)
+
+    def values(self, field):
+        """Finished samples of `field`, oldest first, then the running mean of the current bucket."""
+        i = FIELDS.index(field)
+        values = self.rings[i].values()
+        if self.counts[i]:
+            values.append(self.sums[i] / self.counts[i])
+        return values
+
+
+class StatsRecorder:
+    """Samples a GameState into a Series per entry of RESOLUTIONS."""
+
+    def __init__(self):
+        self.series = {name: Series(interval, size) for name, interval, size in RESOLUTIONS}
+        self.samples = 0   # bumps on every record(); lets graphs know when to redraw
+
+    def record(self, now, state):
+        values = (
+            log10_or_nan(state.resource),
+            log10_or_nan(state.total_rps),
+            float(state.prestige_points),
+            float(state.super_multiplier),
+        )
+        for series in self.series.values():
+            series.add(now, values)
+        self.samples += 1
+
+    # --- Save data ---
+
+    def snapshot(self):
+        """Cheap copy for a save snapshot; savefile turns it into JSON (see StatsSnapshot.to_json)."""
+        return StatsSnapshot(self)
+
+    def load_dict(self, data):
+        if not data or data.get("version", 0) > STATS_VERSION:
+            return
+        for name, series in self.series.items():
+            saved = data.get(name)
+            if saved is None:
+                continue
+            series.bucket = saved["bucket"]
+            series.sums = list(saved["sums"])
+            series.counts = list(saved["counts"])
+            series.rings = [RingBuffer(ring.size) for ring in series.rings]
+            for ring, values in zip(series.rings, saved["rings"]):
+                for value in values[-ring.size:]:
+                    ring.append(NAN if value is None else value)
+        self.samples += 1
+
+
+class StatsSnapshot:
+    """
+    A StatsRecorder's rings copied as arrays, which takes microseconds.
+    Rounding and listing ~17k values takes milliseconds, so that is left to
+    to_json(), which write_save calls on the autosave thread.
+    """
+
+    def __init__(self, recorder):
+        self.series = {
+            name: (series.bucket, list(series.sums), list(series.counts), [ring.values() for ring in series.rings])
+            for name, series in recorder.series.items()
+        }
+
+    def to_json(self):
+        """JSON-friendly save data: NaN becomes None, values keep 4 decimals."""
+        data = {"version": STATS_VERSION}
+        for name, (bucket, sums, counts, rings) in self.series.items():
+            data[name] = {
+                "bucket": bucket,
+                "sums": sums,
+                "counts": counts,
+                "rings": [[round(v, 4) if v == v else None for v in ring] for ring in rings],
+            }
+        return data
+
+
+def value_range(*value_lists):
+    """(low, high) over the finite values, or None if there are none."""
+    finite = [v for values in value_lists for v in values if math.isfinite(v)]
+    if not finite:
+        return None
+    return min(finite), max(finite)
@@ -0,0 +1,221 @@
+"""
+Compare Ascend/Transcend strategies by simulating them, one process per strategy.
+
+Each strategy plays a fresh GameState headlessly: purchases are made by an
+economy policy through GameState.fast_forward, and the prestige policy is
+asked at every check whether to Ascend or Transcend. Reports the game time
+until the Singularity tier is bought, plus a growth curve per strategy.
+
+    python strategy_explorer.py                                  # built-in grid
+    python strategy_explorer.py levels=2000 levels=5000,transcend=3 gain=50
+    python strategy_explorer.py --days 90 --workers 32 --json results.json
+
+Strategy specs are comma-separated rules, any of:
+    levels=N      Ascend once total levels reach N
+    gain=X        Ascend once the gain is at least X% of the current points
+    transcend=K   Transcend after K Ascensions
+"""
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from economy import ChunkedBuyer, GameState, TIER_NAMES_FLAT, buy_cheapest
+from optimizer import PaybackOptimizer
+
+SINGULARITY_INDEX = len(TIER_NAMES_FLAT) - 1
+CLICK_VALUE = 0.01   # what a click earns with no RPS (GameState.get_click_value)
+
+DEFAULT_STRATEGIES = [
+    "never",
+    "levels=1000", "levels=2000", "levels=5000", "levels=10000",
+    "gain=25", "gain=100", "gain=400",
+    "levels=2000,transcend=3", "levels=5000,transcend=3",
+    "gain=100,transcend=5", "gain=100,transcend=20",
+]
+
+
+class PrestigePolicy:
+    """Decides between "ascend", "transcend" and None from a GameState, per a spec string."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.levels = None
+        self.gain_percent = None
+        self.transcend_after = None
+        for rule in spec.split(","):
+            if rule == "never":
+                continue
+            name, _, value = rule.partition("=")
+            if name == "levels":
+                self.levels = int(value)
+            elif name == "gain":
+                self.gain_percent = float(value)
+            elif name == "transcend":
+                self.transcend_after = int(value)
+            else:
+                raise ValueError(f"unknown rule {rule!r} in strategy {spec!r}")
+
+    def __call__(self, state):
+        if (self.transcend_after is not None and state.can_super_prestige()
+                and state.total_ascensions_this_transcendence >= self.transcend_after):
+            return "transcend"
+        if not state.can_prestige():
+            return None
+        # Points apply_prestige would award
+        gain = int(state.calculate_prestige_gain() * state.super_multiplier)
+        if self.levels is not None and state.total_levels >= self.levels:
+            return "ascend"
+        if self.gain_percent is not None and gain >= state.prestige_points * self.gain_percent / 100:
+            return "ascend"
+        return None
+
+
+def bootstrap(state, clicks_per_second):
+    """With no income, click for the cheapest tier. Returns the seconds it took."""
+    tier = state.tiers[0]
+    missing = float(tier.get_cost() - state.resource)
+    seconds = max(0.0, missing / (CLICK_VALUE * clicks_per_second))
+    state.resource = tier.get_cost()
+    state.buy(0, 1)
+    return seconds
+
+
+def log10_or_none(value):
+    return value.log10() if value > 0 else None
+
+
+def make_buyer(name, state, chunk):
+    if name == "payback":
+        return PaybackOptimizer(state)
+    if name == "cheapest":
+        return buy_cheapest
+    return ChunkedBuyer(chunk)
+
+
+def simulate(spec, days=30.0, buyer="chunked", chunk=10, min_check=3600.0, clicks_per_second=5.0, samples=200):
+    """
+    Play one strategy for up to `days` of game time.
+
+    The prestige policy is consulted every 5% of the current run's length, but
+    no more often than every `min_check` seconds, so long runs are not checked
+    needlessly often.
+    """
+    state = GameState()
+    prestige = PrestigePolicy(spec)
+    purchases = make_buyer(buyer, state, chunk)
+    horizon = days * 86400
+    sample_every = horizon / samples
+
+    now = 0.0
+    run_start = 0.0
+    next_sample = 0.0
+    singularity_time = None
+    best_tier = -1
+    ascensions = transcendences = 0
+    curve = []
+    started = time.perf_counter()
+
+    while now < horizon:
+        if not state.total_rps:
+            now += bootstrap(state, clicks_per_second)
+            continue
+
+        step = min(max(min_check, 0.05 * (now - run_start)), horizon - now)
+        state.fast_forward(step, purchases)
+        now += step
+
+        best_tier = max(best_tier, state.highest_owned)
+        if singularity_time is None and state.highest_owned >= SINGULARITY_INDEX:
+            singularity_time = now
+        if now >= next_sample:
+            curve.append([now, log10_or_none(state.resource), log10_or_none(state.total_rps),
+                          state.prestige_points, state.super_multiplier])
+            next_sample += sample_every
+        if singularity_time is not None:
+            break
+
+        action = prestige(state)
+        if action == "ascend":
+            state.apply_prestige()
+            ascensions += 1
+            run_start = now
+        elif action == "transcend":
+            state.apply_super_prestige()
+            transcendences += 1
+            run_start = now
+
+    return {
+        "strategy": spec,
+        "singularity_time": singularity_time,
+        "game_time": now,
+        "ascensions": ascensions,
+        "transcendences": transcendences,
+        "prestige_points": state.prestige_points,
+        "super_multiplier": state.super_multiplier,
+        "highest_tier": best_tier,
+        "log10_resource": log10_or_none(state.resource),
+        "curve": curve,
+        "cpu_seconds": time.perf_counter() - started,
+    }
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "-"
+    days, seconds = divmod(int(seconds), 86400)
+    hours, seconds = divmod(seconds, 3600)
+    return f"{days}d {hours:02d}h {seconds // 60:02d}m"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="\n".join(__doc__.strip().splitlines()[8:]))
+    parser.add_argument("strategies", nargs="*", help="strategy specs (default: a built-in grid)")
+    parser.add_argument("--days", type=float, default=30.0, help="game days to simulate per strategy (default 30)")
+    parser.add_argument("--buyer", choices=["chunked", "cheapest", "payback"], default="chunked",
+                        help="purchase policy: ChunkedBuyer (default), economy.buy_cheapest or optimizer.PaybackOptimizer")
+    parser.add_argument("--chunk", type=int, default=10, help="levels per purchase for the chunked buyer (default 10)")
+    parser.add_argument("--check", type=float, default=3600.0,
+                        help="minimum game seconds between prestige decisions (default 3600)")
+    parser.add_argument("--clicks-per-second", type=float, default=5.0,
+                        help="click rate used to buy the first tier after a reset (default 5)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes (default: all cores)")
+    parser.add_argument("--json", metavar="PATH", help="write full results, including growth curves")
+    args = parser.parse_args()
+
+    strategies = args.strategies or DEFAULT_STRATEGIES
+    for spec in strategies:
+        PrestigePolicy(spec)   # reject bad specs before starting the pool
+
+    jobs = [(spec, args.days, args.buyer, args.chunk, args.check, args.clicks_per_second) for spec in strategies]
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as pool:
+        futures = [pool.submit(simulate, *job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"[{len(results)}/{len(jobs)}] {result['strategy']} ({result['cpu_seconds']:.1f}s)", flush=True)
+    elapsed = time.perf_counter() - started
+
+    # Fastest to the Singularity first, then whoever got furthest
+    results.sort(key=lambda r: (r["singularity_time"] is None, r["singularity_time"] or 0,
+                                -r["highest_tier"], -(r["log10_resource"] or -math.inf)))
+    print(f"\n{'strategy':<28}{'singularity':>16}{'ascend':>8}{'transc':>8}{'tier':>6}{'log10 $':>10}")
+    for r in results:
+        log_resource = f"{r['log10_resource']:.1f}" if r["log10_resource"] is not None else "-"
+        print(f"{r['strategy']:<28}{format_duration(r['singularity_time']):>16}{r['ascensions']:>8}"
+              f"{r['transcendences']:>8}{r['highest_tier'] + 1:>6}{log_resource:>10}")
+    print(f"\n{len(results)} strategies, {args.days:g} game days each, {elapsed:.1f}s wall clock")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"days": args.days, "buyer": args.buyer, "check": args.check, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Caches for pygame surfaces that are expensive to rebuild every frame.
+"""
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font, text, antialias, color), with LRU eviction.
+
+    Returned surfaces are shared between callers, so copy one before changing
+    it (e.g. set_alpha) or use render_alpha.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def render_alpha(self, font, text, antialias, color, alpha):
+        # Private copy so the fade does not leak into the cached surface
+        surface = self.render(font, text, antialias, color).copy()
+        surface.set_alpha(alpha)
+        return surface
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class TooltipCache:
+    """
+    Finished tooltip layouts keyed by (font, text, width, wrap), with LRU eviction.
+
+    `build(font, text, width, wrap)` does the word wrapping and draws the whole
+    tooltip once; after that, hovering only costs a blit.
+    """
+
+    def __init__(self, build, max_entries=64):
+        self.build = build
+        self.max_entries = max_entries
+        self.layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, font, text, width, wrap=True):
+        key = (font, text, width, wrap)
+        layout = self.layouts.get(key)
+        if layout is not None:
+            self.layouts.move_to_end(key)
+            self.hits += 1
+            return layout
+
+        self.misses += 1
+        layout = self.build(font, text, width, wrap)
+        self.layouts[key] = layout
+        if len(self.layouts) > self.max_entries:
+            self.layouts.popitem(last=False)
+        return layout
+
+    def clear(self):
+        self.layouts.clear()
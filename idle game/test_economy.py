@@ -0,0 +1,110 @@
+import json
+import math
+import sys
+
+import pytest
+
+import economy
+from bignum import BigNum
+from economy import MILESTONE_CAP, MILESTONE_START, MILESTONE_STEP, ChunkedBuyer, GameState, TierCatalog
+from savefile import read_save
+
+LEVELS = list(range(MILESTONE_CAP + 101)) + [9000, 10000, 25000, 10 ** 6]
+RPS_BASE = 7
+
+
+def exact_rps(level):
+    """get_rps from the integer formula the bonus table replaced: base * level * 4 * 4**a * 100**b."""
+    rps = RPS_BASE * level
+    if level >= MILESTONE_START:
+        capped = min(level, MILESTONE_CAP)
+        a = (capped - MILESTONE_START) // MILESTONE_STEP
+        b = (capped - MILESTONE_START) // 1000
+        rps *= 4 * 4 ** a * 100 ** b
+    return rps
+
+
+@pytest.fixture(params=["python", "numpy"])
+def catalog(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(economy, "np", None)
+    return TierCatalog(["x"], [RPS_BASE], [RPS_BASE * 50])
+
+
+def test_get_rps_matches_integer_formula(catalog):
+    tier = catalog.tiers[0]
+    for level in LEVELS:
+        tier.level = level
+        expected = exact_rps(level)
+        rps = tier.get_rps()
+        if expected == 0:
+            assert rps == 0
+            continue
+        # BigNum keeps a float mantissa, so "equal" is to float precision
+        assert float(rps / BigNum(expected)) == pytest.approx(1.0, rel=1e-12), level
+
+
+def test_rps_column_matches_integer_formula(catalog):
+    tier = catalog.tiers[0]
+    for level in LEVELS:
+        tier.level = level
+        expected = exact_rps(level)
+        column = float(catalog.rps_log10()[0])
+        if expected == 0:
+            assert column == -math.inf
+        else:
+            assert column == pytest.approx(math.log10(expected), abs=1e-9), level
+
+
+def test_bonus_stops_at_cap(catalog):
+    tier = catalog.tiers[0]
+    tier.level = MILESTONE_CAP
+    at_cap = tier.get_rps() / MILESTONE_CAP
+    tier.level = MILESTONE_CAP * 3
+    assert float(tier.get_rps() / (MILESTONE_CAP * 3) / at_cap) == pytest.approx(1.0, rel=1e-12)
+
+
+def saved_game(resource, seconds_ago, now=1000000.0):
+    state = GameState()
+    state.resource = state.tiers[0].get_cost()
+    state.buy(0, 5)
+    state.resource = BigNum(resource)
+    return state.to_dict(now - seconds_ago)
+
+
+def test_offline_auto_buy_only_spends_offline_income():
+    data = saved_game(1e12, 10)
+    state = GameState()
+    gain, elapsed, spent = state.load_dict(data, 1000000.0, ChunkedBuyer(MILESTONE_STEP))
+    assert elapsed == 10
+    assert spent <= gain
+    assert state.resource >= BigNum(1e12)
+    # Everything bought came out of the offline gain (to float precision at $1e12)
+    assert float(state.resource - BigNum(1e12)) == pytest.approx(float(gain - spent), abs=1e-3)
+
+
+def test_offline_auto_buy_spends_a_long_absence():
+    state = GameState()
+    gain, _, spent = state.load_dict(saved_game(0, 7 * 86400), 1000000.0, ChunkedBuyer(MILESTONE_STEP))
+    assert spent > 0
+    assert state.highest_owned > 10
+    assert abs(float((state.resource - (gain - spent)) / gain)) < 1e-9
+
+
+def test_legacy_save_with_infinity_loads(tmp_path):
+    # The float-era game wrote overflowed numbers as bare Infinity
+    path = tmp_path / "save.json"
+    levels = [5] + [0] * (len(GameState().tiers) - 1)
+    path.write_text(json.dumps({
+        "resource": math.inf,
+        "total_rps": math.inf,
+        "button_levels": levels,
+        "save_time": 0,
+    }))
+    assert "Infinity" in path.read_text()
+    state = GameState()
+    gain, _, _ = state.load_dict(read_save(str(path)), 60)
+    assert state.resource == BigNum(sys.float_info.max) + gain
+    assert state.tiers[0].level == 5